@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import TypeVar
+
+from potion import *
+
+
+E = TypeVar("E", bound=Entity)
+
+
+class EntityPool:
+    """ Keeps entities from unloaded scenes so that they can be reused by the next scene, instead of being created again.
+
+    Only entities that have a `reset` method are pooled. `reset` is called when an entity is reused, and should put the
+    entity back in the state that it was created in (without reloading its sprites and sounds).
+    """
+    _pools: dict[type[Entity], list[Entity]] = {}
+
+    @classmethod
+    def acquire(cls, entity_type: type[E]) -> E:
+        """ Get an entity of the given type, reusing a pooled one if there is one. """
+        if pool := cls._pools.get(entity_type):
+            entity = pool.pop()
+            entity.reset()
+            return entity
+
+        return entity_type()
+
+    @classmethod
+    def acquire_from_ldtk(cls, entity_type: type[E], ldtk_entity: Entity) -> E:
+        """ Get an entity of the given type for an LDtk placeholder entity, reusing a pooled one if there is one.
+        See `Entity.from_ldtk`.
+        """
+        if pool := cls._pools.get(entity_type):
+            entity = pool.pop()
+            entity.reset()
+            return entity._copy_ldtk_entity(ldtk_entity)
+
+        return entity_type.from_ldtk(ldtk_entity)
+
+    @classmethod
+    def release(cls, entity: Entity) -> None:
+        """ Return an entity to the pool, if it can be reset. """
+        if not hasattr(entity, "reset"):
+            return
+
+        # Detach the entity from the scene and level that it was in
+        entity._scene = None
+        entity._level = None
+
+        cls._pools.setdefault(type(entity), []).append(entity)
@@ -1,19 +1,30 @@
+from typing import Self
+
 from potion import *
 
 from entities.mario_brick_fx import MarioBrickFx
 
 
 class MarioBrick(Entity):
+    __slots__ = ("sprite", "sfx")
+
     def __init__(self) -> None:
         super().__init__()
         self.sprite = Sprite.from_atlas("atlas.png", "mario_brick")
+        self.sfx = SoundEffect("sfx/brick_break.wav")
+        self._init_state()
 
+    def _init_state(self) -> None:
         self.collisions_enabled = True
         self.solid = True
         self.width = 8
         self.height = 8
 
-        self.sfx = SoundEffect("sfx/brick_break.wav")
+    def reset(self) -> Self:
+        """ Reset the brick so that it can be reused from the entity pool. """
+        Entity.__init__(self)
+        self._init_state()
+        return self
 
     def on_head_hit(self) -> None:
         self.sfx.play()
@@ -1,13 +1,21 @@
+from typing import Self
+
 from potion import *
 
 from entities.score_fx import ScoreFx
 
 
 class MarioCoin(Entity):
+    __slots__ = ("sprite", "sfx", "timer")
+
     def __init__(self) -> None:
         super().__init__()
-        self.tags.add("Coin")
         self.sprite = AnimatedSprite.from_atlas("atlas.png", "coin")
+        self.sfx = SoundEffect("sfx/coin.wav")
+        self._init_state()
+
+    def _init_state(self) -> None:
+        self.tags.add("Coin")
         self.sprite.play("default")
 
         self.collisions_enabled = True
@@ -16,7 +24,11 @@ class MarioCoin(Entity):
 
         self.timer = 0
 
-        self.sfx = SoundEffect("sfx/coin.wav")
+    def reset(self) -> Self:
+        """ Reset the coin so that it can be reused from the entity pool. """
+        Entity.__init__(self)
+        self._init_state()
+        return self
 
     def update(self) -> None:
         self.sprite.update()
@@ -1,4 +1,6 @@
+from collections import deque
+
 CURRENT_WORLD = ""
 GO_TO_NEXT_WORLD = False
-NEXT_WORLD_QUEUE: list[str] = []
+NEXT_WORLD_QUEUE: deque[str] = deque()
 GAME_OVER = False
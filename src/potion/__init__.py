@@ -30,7 +30,10 @@ from .save_data import SaveData
 from .scene import Scene
 from .sound_effect import SoundEffect
 from .sprite import Sprite
+from .sprite_array import SpriteRenderArray
+from .sprite_batch import SpriteBatch
 from .text import Text
+from .text_atlas import TextAtlas
 from .text_effect import TextEffect
 from .time import Time
 from .timer import Timer
@@ -97,7 +100,10 @@ __all__ = [
     "Scene",
     "SoundEffect",
     "Sprite",
+    "SpriteRenderArray",
+    "SpriteBatch",
     "Text",
+    "TextAtlas",
     "TextEffect",
     "Time",
     "Timer",
@@ -8,6 +8,12 @@ from potion.sprite import Sprite
 
 class AnimatedSprite(Sprite):
     """ A sprite that contains one or more animations. """
+    __slots__ = (
+        "_animation",
+        "_current_animation",
+        "_animations",
+    )
+
     def __init__(self, content_path: str) -> None:
         """ `content_path` is the path to the sprite atlas texture file. """
         super().__init__(content_path)
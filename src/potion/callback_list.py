@@ -10,6 +10,9 @@ class CallbackList(UserList):
         super().__init__()
         self._name = name
 
+        # A snapshot of the callback references, rebuilt when the list changes
+        self._snapshot: tuple = ()
+
     def __str__(self) -> str:
         return f"CallbackList({self._name})"
 
@@ -24,6 +27,7 @@ class CallbackList(UserList):
 
         if cb_ref not in self.data:
             super().append(cb_ref)
+            self._snapshot = tuple(self.data)
 
     def remove(self, callback: Callable) -> None:
         if ismethod(callback):
@@ -33,17 +37,20 @@ class CallbackList(UserList):
 
         if cb_ref in self.data:
             super().remove(cb_ref)
+            self._snapshot = tuple(self.data)
 
     def execute_callbacks(self) -> None:
         """ Execute all callbacks in the list. """
         to_remove = []
 
-        for cb_ref in self.data:
+        for cb_ref in self._snapshot:
             cb = cb_ref()
             if cb:
                 cb()
             else:
                 to_remove.append(cb_ref)
 
-        for cb_ref in to_remove:
-            self.data.remove(cb_ref)
+        if to_remove:
+            for cb_ref in to_remove:
+                self.data.remove(cb_ref)
+            self._snapshot = tuple(self.data)
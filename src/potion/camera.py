@@ -79,14 +79,15 @@ class Camera:
         }
         self._extra_render_passes: list[RenderPass] = []
 
-        # Create a null texture to draw to when an invalid render pass is drawn to
-        self._null_texture = Texture.create_target(2, 2)
+        # A null texture to draw to when an invalid render pass is drawn to
+        # This and the render textures below are created by `_reset_render_targets`.
+        self._null_texture: Texture | None = None
 
         # When the camera renders, it draws everything to its render texture.
         # After it is finished drawing, the render texture is scaled and copied to the main window.
-        self._render_texture = Texture.create_target(2, 2)
+        self._render_texture: Texture | None = None
 
-        self._scaled_render_texture = Texture.create_target(2, 2)
+        self._scaled_render_texture: Texture | None = None
         self._scaled_resolution = Renderer.resolution()
         self._offset_x = 0
         self._offset_y = 0
@@ -94,6 +95,10 @@ class Camera:
         self._sub_pixel_offset_x = 0
         self._sub_pixel_offset_y = 0
 
+        # Size of the render pass textures; used to skip drawing things that are out of view
+        self._render_width = 2
+        self._render_height = 2
+
         # Initialize render passes
         self._reset_render_targets()
 
@@ -403,6 +408,9 @@ class Camera:
             w = self.resolution[0]
             h = self.resolution[1]
 
+        self._render_width = w
+        self._render_height = h
+
         scaled_w = int(w * self._scale_x)
         scaled_h = int(h * self._scale_y)
 
@@ -578,6 +586,14 @@ class Camera:
         y = pmath.remap(screen_y, viewport.top(), viewport.bottom(), 0, resolution_y)
         return Point(x, y)
 
+    def in_view(self, x: int, y: int, width: int, height: int) -> bool:
+        """ Check if a rect (in render coordinates) overlaps the camera's render texture. """
+        return x + width > 0 and y + height > 0 and x < self._render_width and y < self._render_height
+
+    def has_tag_filters(self) -> bool:
+        """ Check if the camera filters the entities it draws by tag. """
+        return self._include_tags_filter_set or self._exclude_tags_filter_set
+
     def can_draw_entity(self, entity: Entity) -> bool:
         """ Check if an entity can be drawn by the camera. """
         # If no tag filters have been set, the entity will always be visible
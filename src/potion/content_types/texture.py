@@ -136,6 +136,11 @@ class Texture:
 
     def set_blend_mode(self, blend_mode: BlendMode) -> None:
         """ Set the texture blend mode. """
+        from potion.renderer import Renderer
+
+        # Deferred draws must be submitted with the blend mode they were drawn with
+        Renderer.flush()
+
         self._blend_mode = blend_mode
         match blend_mode:
             case BlendMode.NONE:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gc
 from statistics import median
 from typing import Callable, TYPE_CHECKING
 
@@ -303,6 +304,9 @@ class Engine:
         if cls._scene:
             cls._scene.draw()
 
+        # Submit any deferred draw calls
+        Renderer.flush()
+
         # Copy the game viewport's texture to the screen
         Renderer.unset_render_target()
         Renderer.copy(
@@ -369,6 +373,11 @@ class Engine:
             Log.debug(f"Unloading {cls._scene}")
             cls._scene.entities.end()
             cls._scene.end()
+            cls._scene.teardown()
+            cls._scene = None
+
+            # Free the old scene now, instead of while the next scene is running
+            gc.collect()
 
         cls._scene = cls._next_scene
 
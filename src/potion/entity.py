@@ -1,10 +1,9 @@
 from __future__ import annotations
 
+from itertools import count
 from math import floor
 from typing import Iterator, Self, TYPE_CHECKING
 
-from ulid import ULID
-
 from potion.data_types.point import Point
 from potion.data_types.rect import Rect
 from potion.engine import Engine
@@ -18,12 +17,27 @@ if TYPE_CHECKING:
     from potion.camera import Camera
 
 
+# Numbers for default entity names; names only need to be unique among the entities in a scene
+_entity_numbers = count(1)
+
+
 class Entity:
     """ Base entity class. """
+    # The base entity's attributes are stored in slots, which are smaller and faster to access than the instance dict.
+    # Subclasses that don't declare their own slots still get a dict for their attributes.
+    __slots__ = (
+        "_scene", "_level", "_name", "_tags", "_active", "_pausable", "_started",
+        "_x", "_y", "_xr", "_yr", "_z",
+        "_collisions_enabled", "_mouse_collisions_enabled", "_solid", "_width", "_height",
+        "_collisions_this_frame", "_collisions_last_frame", "_mouse_this_frame", "_mouse_last_frame",
+        "metadata",
+        "__weakref__",
+    )
+
     def __init__(self) -> None:
         self._scene = None
         self._level = None
-        self._name = f"{self.__class__.__name__}-{ULID()}"
+        self._name = f"{self.__class__.__name__}-{next(_entity_numbers)}"
         self._tags = set()
         self._active = True
         self._pausable = True
@@ -206,6 +220,24 @@ class Entity:
 
         return e
 
+    @classmethod
+    def from_ldtk(cls, ldtk_entity: Entity) -> Self:
+        """ Create an instance of this entity from an LDtk placeholder entity.
+        The new entity gets the placeholder's position, size and metadata; use `LDtk.swap_entities` to swap it in.
+        """
+        return cls()._copy_ldtk_entity(ldtk_entity)
+
+    def _copy_ldtk_entity(self, ldtk_entity: Entity) -> Self:
+        """ Copy the position, size and metadata of an LDtk placeholder entity.
+        The placeholder's values are already whole numbers, so they're copied without going through the setters.
+        """
+        self._x = ldtk_entity._x
+        self._y = ldtk_entity._y
+        self._width = ldtk_entity._width
+        self._height = ldtk_entity._height
+        self.metadata.update(ldtk_entity.metadata)
+        return self
+
     def position(self) -> Point:
         """ The position of the entity. """
         return Point(self._x, self._y)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterator, TYPE_CHECKING
+from typing import Callable, Iterable, Iterator, TYPE_CHECKING
 
 from potion.entity import Entity
 from potion.log import Log
@@ -30,6 +30,12 @@ class EntityList:
         self._entity_draw_list: list[Entity] = []
         self._entity_draw_list_needs_sorting = False
 
+        # Parallel lists of the active entities in draw order, and their bound draw methods.
+        # These are rebuilt whenever the draw list or the set of active entities changes, so the draw loop doesn't have
+        #   to test each entity or look up its draw method every frame.
+        self._active_draw_entities: list[Entity] = []
+        self._active_draw_methods: list[Callable[[Camera], None]] = []
+
         # Add / remove queue
         self._to_add: list[Entity] = []
         self._to_remove: list[Entity] = []
@@ -52,6 +58,11 @@ class EntityList:
         for entity in self._entity_list:
             yield entity
 
+    def queued_entities(self) -> Iterator[Entity]:
+        """ Iterate over entities that are queued to be added in the next update. """
+        for entity in self._to_add:
+            yield entity
+
     def active_entities(self) -> Iterator[Entity]:
         """ Iterate over active entities. """
         for entity in self:
@@ -82,6 +93,59 @@ class EntityList:
         if entity in self._entity_list and entity not in self._to_remove:
             self._to_remove.append(entity)
 
+    def add_many(self, entities: Iterable[Entity]) -> None:
+        """ Add many entities to the list.
+        This has the same result as calling `add` for each entity, but checks for entities that are already in the list
+            once for the whole batch instead of searching the list for every entity.
+        """
+        if self._is_updating:
+            self._added_while_updating.extend(entities)
+            return
+
+        listed = set(self._entity_list)
+        listed.update(self._to_add)
+
+        added = False
+        for entity in entities:
+            if entity.name in self._name_to_add:
+                Log.error(f"Cannot add {entity}; an entity named '{entity.name}' already exists")
+                continue
+
+            if entity not in listed:
+                listed.add(entity)
+                self._to_add.append(entity)
+                self._name_to_add.add(entity.name)
+                added = True
+
+        if added:
+            self.flag_entity_draw_list_needs_sorting()
+
+    def remove_many(self, entities: Iterable[Entity]) -> None:
+        """ Remove many entities from the list.
+        This has the same result as calling `remove` for each entity, but checks the list once for the whole batch.
+        Entities that are still queued to be added are taken out of the queue instead, so they are never added.
+        """
+        if self._is_updating:
+            self._removed_while_updating.extend(entities)
+            return
+
+        listed = set(self._entity_list)
+        queued = set(self._to_remove)
+        unqueued = set()
+        for entity in entities:
+            if entity in listed:
+                if entity not in queued:
+                    queued.add(entity)
+                    self._to_remove.append(entity)
+            else:
+                unqueued.add(entity)
+
+        if unqueued:
+            to_add = [entity for entity in self._to_add if entity not in unqueued]
+            if len(to_add) != len(self._to_add):
+                self._to_add[:] = to_add
+                self._name_to_add = {entity.name for entity in to_add}
+
     def set_active(self, entity: Entity) -> None:
         """ Activate an entity in the list. """
         if entity in self._to_deactivate:
@@ -98,6 +162,26 @@ class EntityList:
         if entity not in self._to_deactivate:
             self._to_deactivate.append(entity)
 
+    def set_many_active(self, entities: Iterable[Entity], value: bool) -> None:
+        """ Activate or deactivate many entities in the list.
+        This queues the same changes as calling `set_active` or `set_inactive` for each entity, but checks the queues
+            once for the whole batch instead of searching them for every entity.
+        """
+        batch = dict.fromkeys(entities)
+        if not batch:
+            return
+
+        if value:
+            queue, opposite_queue = self._to_activate, self._to_deactivate
+        else:
+            queue, opposite_queue = self._to_deactivate, self._to_activate
+
+        if opposite_queue:
+            opposite_queue[:] = [entity for entity in opposite_queue if entity not in batch]
+
+        queued = set(queue)
+        queue.extend(entity for entity in batch if entity not in queued)
+
     def rename(self, old_name: str, new_name: str) -> bool:
         """ Rename an entity.
         Returns True if successful, otherwise returns False.
@@ -136,8 +220,11 @@ class EntityList:
             entity._scene = self._scene
 
         # Remove queued entities
+        if self._to_remove:
+            removed = set(self._to_remove)
+            self._entity_list[:] = [entity for entity in self._entity_list if entity not in removed]
+
         for entity in self._to_remove:
-            self._entity_list.remove(entity)
             self._entity_draw_list.append(entity)
             self._entity_map.pop(entity.name)
             self.set_inactive(entity)
@@ -165,6 +252,8 @@ class EntityList:
         # Sort
         if self._entity_draw_list_needs_sorting:
             self.sort_draw_list()
+        elif self._to_add or self._to_remove or self._to_activate or self._to_deactivate:
+            self._update_active_draw_lists()
 
         # Clear lists
         self._to_add.clear()
@@ -190,6 +279,12 @@ class EntityList:
         """ Sort the entity draw list based on their Z position. """
         self._entity_draw_list.sort(key=lambda e: e.z, reverse=True)
         self._entity_draw_list_needs_sorting = False
+        self._update_active_draw_lists()
+
+    def _update_active_draw_lists(self) -> None:
+        """ Rebuild the parallel lists of active entities and draw methods, in draw order. """
+        self._active_draw_entities = [entity for entity in self._entity_draw_list if entity.active]
+        self._active_draw_methods = [entity.draw for entity in self._active_draw_entities]
 
     def update(self) -> None:
         """ Update loop. """
@@ -215,10 +310,14 @@ class EntityList:
 
     def draw(self, camera: Camera) -> None:
         """ Draw loop. """
-        for entity in self._entity_draw_list:
-            if entity.active:
-                if camera.can_draw_entity(entity):
-                    entity.draw(camera)
+        if camera.has_tag_filters():
+            can_draw_entity = camera.can_draw_entity
+            for entity, draw in zip(self._active_draw_entities, self._active_draw_methods):
+                if can_draw_entity(entity):
+                    draw(camera)
+        else:
+            for draw in self._active_draw_methods:
+                draw(camera)
 
     def debug_draw(self, camera: Camera) -> None:
         """ Debug draw pass. """
@@ -235,3 +334,17 @@ class EntityList:
 
         for entity in self:
             entity.end()
+
+    def clear(self) -> None:
+        """ Remove every entity from the list without calling any lifecycle methods.
+        This is used to drop references to the entities once the scene has ended.
+        """
+        for entities in (
+                self._entity_list, self._entity_draw_list, self._active_draw_entities, self._active_draw_methods,
+                self._to_add, self._to_remove, self._to_activate, self._to_deactivate,
+                self._added_while_updating, self._removed_while_updating,
+        ):
+            entities.clear()
+
+        self._entity_map.clear()
+        self._name_to_add.clear()
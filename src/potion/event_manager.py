@@ -38,6 +38,8 @@ class EventManager:
                 EventManager._controller_event(event)
             case sdl2.SDL_RENDER_TARGETS_RESET | sdl2.SDL_RENDER_DEVICE_RESET:
                 EventManager._render_reset_event()
+            case sdl2.SDL_DISPLAYEVENT:
+                Window.invalidate_display_mode()
 
     @staticmethod
     def _quit_event() -> None:
@@ -49,8 +51,13 @@ class EventManager:
     def _window_event(event: sdl2.SDL_Event) -> None:
         """ Handle any window event. """
         match event.window.event:
+            case sdl2.SDL_WINDOWEVENT_MOVED | sdl2.SDL_WINDOWEVENT_SIZE_CHANGED:
+                Window.invalidate_geometry_cache()
             case sdl2.SDL_WINDOWEVENT_RESIZED:
+                Window.invalidate_geometry_cache()
                 Window.on_window_resized()
+            case sdl2.SDL_WINDOWEVENT_DISPLAY_CHANGED:
+                Window.invalidate_display_mode()
             case sdl2.SDL_WINDOWEVENT_ENTER:
                 InputManager.register_mouse_enter_window()
             case sdl2.SDL_WINDOWEVENT_LEAVE:
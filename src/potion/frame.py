@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -30,6 +30,14 @@ class Frame:
     # Extra metadata
     metadata: dict[str, Any]
 
+    # The trimmed distance from the right/bottom edge of the frame to the original canvas edge
+    offset_right: int = field(init=False)
+    offset_bottom: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.offset_right = self.sprite_width - self.frame_width - self.offset_x
+        self.offset_bottom = self.sprite_height - self.frame_height - self.offset_y
+
     def __str__(self) -> str:
         return f"Frame({self.name})"
 
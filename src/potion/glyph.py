@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import Type, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from potion.data_types.rect import Rect
+    from potion.text_effect import TextEffect
 
 
-@dataclass
+@dataclass(slots=True)
 class Glyph:
     """ Stores data about a renderable character in a text string. """
     # The character from the source text that will be rendered.
@@ -38,6 +39,9 @@ class Glyph:
     # An optional tag.
     tag: str | None
 
+    # The text effect registered for the tag, if there is one.
+    effect: Type[TextEffect] | None = None
+
     def __str__(self) -> str:
         return f"Glyph({self.character})"
 
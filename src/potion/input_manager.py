@@ -12,6 +12,13 @@ if TYPE_CHECKING:
     from potion.input_button import InputButton
 
 
+# Scratch ints that SDL writes the mouse position into, so that they aren't allocated every frame
+_mouse_x = c_int()
+_mouse_y = c_int()
+_mouse_x_ref = byref(_mouse_x)
+_mouse_y_ref = byref(_mouse_y)
+
+
 class InputManager:
     """ Get keyboard, mouse, and controller input. """
     # The input system with the most recent activity
@@ -78,11 +85,9 @@ class InputManager:
         cls.__mouse_scroll_wheel = 0
 
         # Update mouse position
-        mouse_x = c_int()
-        mouse_y = c_int()
-        sdl2.SDL_GetMouseState(byref(mouse_x), byref(mouse_y))
-        cls.__mouse_x = mouse_x.value
-        cls.__mouse_y = mouse_y.value
+        sdl2.SDL_GetMouseState(_mouse_x_ref, _mouse_y_ref)
+        cls.__mouse_x = _mouse_x.value
+        cls.__mouse_y = _mouse_y.value
         if cls.__mouse_x != cls.__previous_mouse_x or cls.__mouse_y != cls.__previous_mouse_y:
             cls.set_mouse_active()
 
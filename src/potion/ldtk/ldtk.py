@@ -1,6 +1,10 @@
 import csv
 import json
-from typing import Iterator
+import sys
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Iterable, Iterator
 
 from potion.content import Content
 from potion.entity import Entity
@@ -12,16 +16,34 @@ from potion.scene import Scene
 from potion.sprite import Sprite
 
 
+# The number of parsed LDtk data files (project, level and grid files) to keep, so that revisiting a world doesn't parse
+#   its files again
+FILE_CACHE_SIZE = 64
+
+
 class LDtk:
     """ Load LDtk project data. """
+    # Parsed data files, by content path
+    # The cache is shared with the preload thread, so it's only accessed while holding the lock.
+    _file_cache: OrderedDict[str, Any] = OrderedDict()
+    _file_cache_lock = threading.Lock()
+
+    # Events that are set when a project has been preloaded, by content path
+    _preloads: dict[str, threading.Event] = {}
+
     @classmethod
-    def load_simplified(cls, scene: Scene, content_path: str) -> None:
+    def load_simplified(cls, scene: Scene, content_path: str, defer_update: bool = False) -> None:
         """ Load entities into the scene from an LDtk 'Super Simple Export'.
         `content_path` is the path to the *.ldtk project file.
+        If `defer_update` is True, the scene's entity list is not updated; the loaded entities stay queued until the
+            next update (e.g. the one at the end of `Scene.on_load`), so that they can be swapped in the same batch.
         """
+        # If the project is being preloaded, wait for it to finish instead of parsing the same files again
+        if preload := cls._preloads.get(content_path):
+            preload.wait()
+
         # Load project data
-        with Content.open(content_path) as fp:
-            project_data = json.load(fp)
+        project_data = cls._read_json(content_path)
 
         # Make sure "Super Simple Export" was used
         if not project_data.get('simplifiedExport'):
@@ -61,8 +83,7 @@ class LDtk:
                 Log.error(f"Could not find level data file: {level_json}")
                 continue
 
-            with Content.open(level_json) as fp:
-                level_data = json.load(fp)
+            level_data = cls._read_json(level_json)
 
             # Get level info
             level_id = level_data['uniqueIdentifer']
@@ -124,13 +145,11 @@ class LDtk:
 
                     # Set grid values from csv
                     csv_file = f"{level_folder}/{layer_name}.csv"
-                    with Content.open(csv_file) as fp:
-                        reader = csv.reader(fp)
-                        for y, row in enumerate(reader):
-                            for x, cell in enumerate(row):
-                                if cell:
-                                    value = int(cell)
-                                    int_grid.set_value(x, y, value)
+                    for y, row in enumerate(cls._read_csv(csv_file)):
+                        for x, cell in enumerate(row):
+                            if cell:
+                                value = int(cell)
+                                int_grid.set_value(x, y, value)
 
                     # Set sprite
                     sprite_file = f"{level_folder}/{layer_name}.png"
@@ -144,6 +163,9 @@ class LDtk:
                 # Entities
                 elif layer_type == "Entities":
                     for entity_name, entity_instances in level_data['entities'].items():
+                        # Intern the name, so that lookups by name can match it by identity
+                        entity_name = sys.intern(entity_name)
+
                         for instance_data in entity_instances:
                             # Get entity data
                             entity_id = instance_data['iid']
@@ -253,12 +275,111 @@ class LDtk:
 
         # Force an update of the list so that the entities are in the scene
         # Remember, this will call `awake()`, `on_activate()` and `start()` on all loaded entities
-        scene.entities.update_list()
+        if not defer_update:
+            scene.entities.update_list()
+
+    @classmethod
+    def preload_simplified(cls, content_paths: list[str]) -> None:
+        """ Parse the data files of LDtk 'Super Simple Export' projects on a background thread.
+        Loading one of the projects afterward uses the parsed data, or waits for the preload to finish if it's still
+            running.
+        """
+        content_paths = [content_path for content_path in content_paths if content_path not in cls._preloads]
+        if not content_paths:
+            return
+
+        for content_path in content_paths:
+            cls._preloads[content_path] = threading.Event()
+
+        thread = threading.Thread(target=cls._preload_projects, args=(content_paths,), daemon=True)
+        thread.start()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """ Forget all parsed data files. """
+        with cls._file_cache_lock:
+            cls._file_cache.clear()
+
+    @classmethod
+    def _preload_projects(cls, content_paths: list[str]) -> None:
+        """ Parse the data files of each project into the cache. """
+        for content_path in content_paths:
+            try:
+                cls._preload_project(content_path)
+            except Exception:  # noqa
+                # Any problems with the project are reported when it's loaded
+                pass
+            finally:
+                cls._preloads[content_path].set()
+
+    @classmethod
+    def _preload_project(cls, content_path: str) -> None:
+        """ Parse the project file, and the level and grid files that `load_simplified` reads. """
+        project_data = cls._read_json(content_path)
+        if not project_data.get('simplifiedExport'):
+            return
+
+        project_folder = Content.parent(content_path)
+        project_name = Content.stem(content_path)
+        simplified_export_root = f"{project_folder}/{project_name}/simplified"
+
+        int_grid_layer_names = [
+            layer_data['identifier'] for layer_data in project_data['defs']['layers']
+            if layer_data['type'] == "IntGrid"
+        ]
+
+        for level_data in project_data['levels']:
+            level_folder = f"{simplified_export_root}/{level_data['identifier']}"
+            level_json = f"{level_folder}/data.json"
+            if not Content.is_file(level_json):
+                continue
+
+            cls._read_json(level_json)
+            for layer_name in int_grid_layer_names:
+                cls._read_csv(f"{level_folder}/{layer_name}.csv")
+
+    @classmethod
+    def _read_json(cls, content_path: str) -> Any:
+        """ Read a JSON data file, using the cached data if it has already been parsed.
+        The cached data is shared between loads, so it must not be modified.
+        """
+        with cls._file_cache_lock:
+            if content_path in cls._file_cache:
+                cls._file_cache.move_to_end(content_path)
+                return cls._file_cache[content_path]
+
+        with Content.open(content_path) as fp:
+            data = json.load(fp)
+
+        cls._cache_file(content_path, data)
+        return data
+
+    @classmethod
+    def _read_csv(cls, content_path: str) -> list[list[str]]:
+        """ Read the rows of a CSV data file, using the cached rows if it has already been parsed. """
+        with cls._file_cache_lock:
+            if content_path in cls._file_cache:
+                cls._file_cache.move_to_end(content_path)
+                return cls._file_cache[content_path]
+
+        with Content.open(content_path) as fp:
+            rows = list(csv.reader(fp))
+
+        cls._cache_file(content_path, rows)
+        return rows
+
+    @classmethod
+    def _cache_file(cls, content_path: str, data: Any) -> None:
+        """ Add parsed data to the cache, dropping the least recently used data if the cache is full. """
+        with cls._file_cache_lock:
+            cls._file_cache[content_path] = data
+            if len(cls._file_cache) > FILE_CACHE_SIZE:
+                cls._file_cache.popitem(last=False)
 
     @classmethod
     def ldtk_entities(cls, scene: Scene) -> Iterator[Entity]:
-        """ Iterate over LDtk placeholder entities. """
-        for entity in scene.entities:
+        """ Iterate over LDtk placeholder entities, including the ones that are still queued to be added. """
+        for entity in chain(scene.entities, scene.entities.queued_entities()):
             if "ldtk_entity" in entity.tags:
                 yield entity
 
@@ -267,24 +388,55 @@ class LDtk:
         """ Swap an LDtk entity for another entity.
         This is a convenience function to make it easy to swap out the "placeholder" entity from LDtk with a "real" one.
         """
+        scene = ldtk_entity.scene
+        if cls._swap_entity_data(ldtk_entity, entity):
+            # Swap scene membership
+            scene.entities.add(entity)
+            scene.entities.remove(ldtk_entity)
+
+    @classmethod
+    def swap_entities(cls, swaps: Iterable[tuple[Entity, Entity]], copy_data: bool = True) -> None:
+        """ Swap many LDtk entities for other entities.
+        This is the same as calling `swap_entity` for each (LDtk entity, entity) pair, but the entities are added to and
+            removed from each scene's entity list in one batch.
+        If the entities were created with `Entity.from_ldtk`, pass `copy_data=False` to skip copying the LDtk data again.
+        """
+        scene_swaps: dict[Scene, tuple[list[Entity], list[Entity]]] = {}
+        for ldtk_entity, entity in swaps:
+            # Entities that are still queued to be added aren't in a scene yet, but their level is
+            scene = ldtk_entity.scene or ldtk_entity.level.scene
+            if cls._swap_entity_data(ldtk_entity, entity, copy_data):
+                to_add, to_remove = scene_swaps.setdefault(scene, ([], []))
+                to_add.append(entity)
+                to_remove.append(ldtk_entity)
+
+        # Swap scene membership
+        for scene, (to_add, to_remove) in scene_swaps.items():
+            scene.entities.add_many(to_add)
+            scene.entities.remove_many(to_remove)
+
+    @classmethod
+    def _swap_entity_data(cls, ldtk_entity: Entity, entity: Entity, copy_data: bool = True) -> bool:
+        """ Copy the data from an LDtk entity to another entity (if `copy_data` is True), and swap their level
+            membership.
+        Returns False if the source entity is not an LDtk entity.
+        """
         # Make sure the source entity is an LDtk entity
         if "ldtk_entity" not in ldtk_entity.tags:
             Log.error(f"Not an LDtk entity: {ldtk_entity}")
-            return
+            return False
 
         # Copy entity data
-        entity.x = ldtk_entity.x
-        entity.y = ldtk_entity.y
-        entity.width = ldtk_entity.width
-        entity.height = ldtk_entity.height
-        entity.metadata.update(**ldtk_entity.metadata)
+        if copy_data:
+            entity.x = ldtk_entity.x
+            entity.y = ldtk_entity.y
+            entity.width = ldtk_entity.width
+            entity.height = ldtk_entity.height
+            entity.metadata.update(**ldtk_entity.metadata)
 
         # Swap level membership
         level = ldtk_entity.level
         level.add_entity(entity)
         level.remove_entity(ldtk_entity)
 
-        # Swap scene membership
-        scene = ldtk_entity.scene
-        scene.entities.add(entity)
-        scene.entities.remove(ldtk_entity)
+        return True
@@ -216,8 +216,8 @@ class Level:
 
     def set_entities_active(self, value: bool) -> None:
         """ Set the active status on all entities in the level. """
-        for entity in self.entities:
-            entity.active = value
+        if scene := self._scene:
+            scene.entities.set_many_active([entity for entity in self.entities if entity.scene is scene], value)
 
     def move(self, x: int, y: int, move_entities: bool = True) -> None:
         """ Move the level.
@@ -10,26 +10,29 @@ logger.setLevel(logging.ERROR)
 
 
 class Log:
-    """ Write log messages. """
+    """ Write log messages.
+    Extra args are %-formatted into the message by the logger, only if the message is logged (e.g.
+        `Log.warning("Could not find '%s'", name)`).
+    """
     @classmethod
-    def debug(cls, msg: Any) -> None:
+    def debug(cls, msg: Any, *args: Any) -> None:
         """ Log a debug message. """
-        logger.debug(str(msg))
+        logger.debug(str(msg), *args)
 
     @classmethod
-    def info(cls, msg: Any) -> None:
+    def info(cls, msg: Any, *args: Any) -> None:
         """ Log an info message. """
-        logger.info(str(msg))
+        logger.info(str(msg), *args)
 
     @classmethod
-    def warning(cls, msg: Any) -> None:
+    def warning(cls, msg: Any, *args: Any) -> None:
         """ Log a warning message. """
-        logger.warning(str(msg))
+        logger.warning(str(msg), *args)
 
     @classmethod
-    def error(cls, msg: Any) -> None:
+    def error(cls, msg: Any, *args: Any) -> None:
         """ Log an error message. """
-        logger.error(str(msg))
+        logger.error(str(msg), *args)
 
 
 class ConsoleFormatter(logging.Formatter):
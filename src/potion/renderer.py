@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from ctypes import byref, c_int, pointer, POINTER
+from ctypes import Array, byref, c_int, pointer, POINTER
 from pathlib import Path
-from typing import Callable, Generator, TYPE_CHECKING
+from typing import Callable, Generator, Sequence, TYPE_CHECKING
+from weakref import WeakKeyDictionary
 
 import sdl2
 import sdl2.sdlimage
@@ -20,6 +21,33 @@ if TYPE_CHECKING:
     from potion.data_types.point import Point
     from potion.data_types.rect import Rect
 
+# Bind the hot SDL entry points once, so each call skips the module attribute lookup.
+# The SDL_gfx functions are bound to their raw ctypes functions, bypassing PySDL2's Python wrappers.
+_SDL_SetRenderDrawColor = sdl2.SDL_SetRenderDrawColor
+_SDL_SetRenderDrawBlendMode = sdl2.SDL_SetRenderDrawBlendMode
+_SDL_SetRenderTarget = sdl2.SDL_SetRenderTarget
+_SDL_RenderSetClipRect = sdl2.SDL_RenderSetClipRect
+_SDL_RenderClear = sdl2.SDL_RenderClear
+_SDL_RenderCopy = sdl2.SDL_RenderCopy
+_SDL_RenderCopyEx = sdl2.SDL_RenderCopyEx
+_SDL_RenderDrawPoint = sdl2.SDL_RenderDrawPoint
+_SDL_RenderDrawPoints = sdl2.SDL_RenderDrawPoints
+_SDL_RenderDrawLine = sdl2.SDL_RenderDrawLine
+_SDL_RenderDrawRect = sdl2.SDL_RenderDrawRect
+_SDL_RenderDrawRects = sdl2.SDL_RenderDrawRects
+_SDL_RenderFillRect = sdl2.SDL_RenderFillRect
+_SDL_RenderFillRects = sdl2.SDL_RenderFillRects
+_SDL_RenderGeometry = sdl2.SDL_RenderGeometry
+_SDL_SetTextureColorMod = sdl2.SDL_SetTextureColorMod
+_SDL_SetTextureAlphaMod = sdl2.SDL_SetTextureAlphaMod
+_thickLineRGBA = sdlgfx._ctypes["thickLineRGBA"]
+_roundedRectangleRGBA = sdlgfx._ctypes["roundedRectangleRGBA"]
+_circleRGBA = sdlgfx._ctypes["circleRGBA"]
+_filledCircleRGBA = sdlgfx._ctypes["filledCircleRGBA"]
+
+# The texture color mod that leaves colors unchanged
+_NO_COLOR_MOD = (255, 255, 255)
+
 
 class Renderer:
     """ The rendering context for the window. """
@@ -29,6 +57,27 @@ class Renderer:
     _sdl_renderer = None
 
     _clip_rect: Rect | None = None
+    _current_target: Texture | None = None
+
+    # A callback that submits draw calls that have been deferred (e.g. batched sprites).
+    # Every rendering operation runs it first, so deferred draws always land in order.
+    _deferred_flush: Callable[[], None] | None = None
+
+    _last_draw_color: tuple[int, int, int, int] | None = None
+    _last_draw_blend_mode: int | None = None
+
+    _rect_buffer = (sdl2.SDL_Rect * 0)()
+
+    # Scratch structs for `copy_raw` and `copy_plain`; SDL reads them immediately, so they can be reused for every call
+    _raw_destination_rect = sdl2.SDL_Rect()
+    _raw_rotation_center = sdl2.SDL_Point()
+
+    # The color/alpha mods that were last set on each texture, so that unchanged mods don't go through SDL again.
+    # Textures that aren't in here still have SDL's defaults (no color mod, full alpha).
+    _texture_color_mods: WeakKeyDictionary[Texture, tuple[int, int, int]] = WeakKeyDictionary()
+    _texture_alpha_mods: WeakKeyDictionary[Texture, int] = WeakKeyDictionary()
+
+    _rounded_rect_geometry_cache: dict[tuple, tuple[list[tuple[int, int]], Array[sdl2.SDL_Vertex], Array[c_int]]] = {}
 
     _reset_callbacks = CallbackList("RendererReset")
     _resolution_change_callbacks = CallbackList("RendererResolutionChange")
@@ -102,24 +151,35 @@ class Renderer:
     @classmethod
     def set_render_target(cls, texture: Texture) -> None:
         """ Set the render target to a texture. """
-        sdl2.SDL_SetRenderTarget(cls._sdl_renderer, texture.sdl_texture)
+        if cls._deferred_flush:
+            cls.flush()
+
+        cls._current_target = texture
+        _SDL_SetRenderTarget(cls._sdl_renderer, texture.sdl_texture)
 
     @classmethod
     def unset_render_target(cls) -> None:
         """ Clear the current render target; it will be set back to the window. """
-        sdl2.SDL_SetRenderTarget(cls._sdl_renderer, None)
+        if cls._deferred_flush:
+            cls.flush()
+
+        cls._current_target = None
+        _SDL_SetRenderTarget(cls._sdl_renderer, None)
 
     @classmethod
     @contextmanager
     def render_target(cls, texture: Texture) -> Generator:
         """ Context manager to temporarily render to a target texture. """
         old_clip_rect = cls._clip_rect
-        old_target = sdl2.SDL_GetRenderTarget(cls._sdl_renderer)
-        Renderer.set_render_target(texture)
+        old_target = cls._current_target
+        cls.set_render_target(texture)
 
         yield
 
-        sdl2.SDL_SetRenderTarget(cls._sdl_renderer, old_target)
+        if old_target is not None:
+            cls.set_render_target(old_target)
+        else:
+            cls.unset_render_target()
         cls.set_clip_rect(old_clip_rect)
 
     @classmethod
@@ -127,16 +187,32 @@ class Renderer:
         """ Set the clip rectangle for rendering.
         IMPORTANT:Changing the render target with the clip rect active will clear the current clip rect.
         """
+        if cls._deferred_flush:
+            cls.flush()
+
         cls._clip_rect = rect
         if rect:
             rect = rect.to_sdl_rect()
-        sdl2.SDL_RenderSetClipRect(cls._sdl_renderer, rect)
+        _SDL_RenderSetClipRect(cls._sdl_renderer, rect)
 
     @classmethod
     def clear(cls, color: Color = Color.transparent()) -> None:
         """ Clear the current rendering target. """
-        sdl2.SDL_SetRenderDrawColor(cls._sdl_renderer, *color)
-        sdl2.SDL_RenderClear(cls._sdl_renderer)
+        if cls._deferred_flush:
+            cls.flush()
+
+        cls._set_draw_color(color)
+        _SDL_RenderClear(cls._sdl_renderer)
+
+    @classmethod
+    def clear_rect(cls, rect: Rect, color: Color = Color.transparent()) -> None:
+        """ Clear part of the current rendering target. """
+        if cls._deferred_flush:
+            cls.flush()
+
+        cls._set_draw_blend_mode(sdl2.SDL_BLENDMODE_NONE)
+        cls._set_draw_color(color)
+        _SDL_RenderFillRect(cls._sdl_renderer, rect.to_sdl_rect())
 
     @classmethod
     def copy(cls,
@@ -148,6 +224,9 @@ class Renderer:
              flip: int,
              ) -> None:
         """ Copy a texture to the rendering target. """
+        if cls._deferred_flush:
+            cls.flush()
+
         if source_rect:
             source_rect = source_rect.to_sdl_rect()
 
@@ -157,7 +236,7 @@ class Renderer:
         if rotation_center:
             rotation_center = pointer(rotation_center.to_sdl_point())
 
-        sdl2.SDL_RenderCopyEx(
+        _SDL_RenderCopyEx(
             cls._sdl_renderer,
             texture.sdl_texture,
             source_rect,
@@ -167,63 +246,220 @@ class Renderer:
             flip
         )
 
+    @classmethod
+    def copy_raw(cls,
+                 texture: Texture,
+                 source_rect: sdl2.SDL_Rect | None,
+                 x: int,
+                 y: int,
+                 width: int,
+                 height: int,
+                 rotation_angle: float,
+                 rotation_center: tuple[int, int] | None,
+                 flip: int,
+                 ) -> None:
+        """ Copy a texture to the rendering target, with the destination rect and rotation center given as ints.
+        The source rect is an SDL_Rect that the caller keeps around, so nothing is converted on each call.
+        """
+        if cls._deferred_flush:
+            cls.flush()
+
+        destination_rect = cls._raw_destination_rect
+        destination_rect.x = x
+        destination_rect.y = y
+        destination_rect.w = width
+        destination_rect.h = height
+
+        center = None
+        if rotation_center:
+            center = cls._raw_rotation_center
+            center.x, center.y = rotation_center
+
+        _SDL_RenderCopyEx(
+            cls._sdl_renderer,
+            texture.sdl_texture,
+            source_rect,
+            destination_rect,
+            rotation_angle,
+            center,
+            flip
+        )
+
+    @classmethod
+    def copy_plain(cls,
+                   texture: Texture,
+                   source_rect: sdl2.SDL_Rect | None,
+                   x: int,
+                   y: int,
+                   width: int,
+                   height: int,
+                   ) -> None:
+        """ Like `copy_raw`, for copies with no rotation or flip.
+        This uses SDL_RenderCopy, which skips the rotation setup that SDL_RenderCopyEx does.
+        """
+        if cls._deferred_flush:
+            cls.flush()
+
+        destination_rect = cls._raw_destination_rect
+        destination_rect.x = x
+        destination_rect.y = y
+        destination_rect.w = width
+        destination_rect.h = height
+
+        _SDL_RenderCopy(cls._sdl_renderer, texture.sdl_texture, source_rect, destination_rect)
+
+    @classmethod
+    def copy_many(cls,
+                  texture: Texture,
+                  source_rects: Sequence[int],
+                  destination_rects: Sequence[int],
+                  rotation_angles: Sequence[float],
+                  rotation_centers: Sequence[int],
+                  flips: Sequence[int],
+                  ) -> None:
+        """ Copy a texture to the rendering target many times.
+        The inputs are flat, parallel sequences (e.g. `array.array`):
+            source_rects and destination_rects hold 4 values (x, y, w, h) per copy.
+            rotation_centers holds 2 values (x, y) per copy.
+            rotation_angles and flips hold 1 value per copy.
+        """
+        if cls._deferred_flush:
+            cls.flush()
+
+        render_copy_ex = _SDL_RenderCopyEx
+        sdl_renderer = cls._sdl_renderer
+        sdl_texture = texture.sdl_texture
+
+        # Reuse the same structs for every copy; SDL reads them immediately.
+        src = sdl2.SDL_Rect()
+        dst = sdl2.SDL_Rect()
+        center = sdl2.SDL_Point()
+
+        for i in range(len(flips)):
+            r = i * 4
+            src.x, src.y, src.w, src.h = source_rects[r:r + 4]
+            dst.x, dst.y, dst.w, dst.h = destination_rects[r:r + 4]
+            c = i * 2
+            center.x, center.y = rotation_centers[c:c + 2]
+            render_copy_ex(sdl_renderer, sdl_texture, src, dst, rotation_angles[i], center, flips[i])
+
+    @classmethod
+    def defer(cls, flush: Callable[[], None]) -> None:
+        """ Register a callback that submits deferred draw calls.
+        It will be run before the next rendering operation, or when `flush` is called.
+        """
+        if cls._deferred_flush and cls._deferred_flush != flush:
+            cls.flush()
+        cls._deferred_flush = flush
+
+    @classmethod
+    def flush(cls) -> None:
+        """ Submit any deferred draw calls. """
+        if flush := cls._deferred_flush:
+            cls._deferred_flush = None
+            flush()
+
     @classmethod
     def present(cls) -> None:
         """ Update the screen with any rendering performed since the previous call. """
+        if cls._deferred_flush:
+            cls.flush()
+
         sdl2.SDL_RenderPresent(cls._sdl_renderer)
 
     @classmethod
     def draw_point(cls, point: Point, color: Color) -> None:
         """ Draw a point. """
-        sdl2.SDL_SetRenderDrawColor(cls._sdl_renderer, *color)
-        sdl2.SDL_RenderDrawPoint(cls._sdl_renderer, point.x, point.y)
+        if cls._deferred_flush:
+            cls.flush()
+
+        cls._set_draw_color(color)
+        _SDL_RenderDrawPoint(cls._sdl_renderer, point.x, point.y)
 
     @classmethod
     def draw_points(cls, points: list[Point], color: Color) -> None:
         """ Draw a list of points. """
-        sdl2.SDL_SetRenderDrawColor(cls._sdl_renderer, *color)
+        if cls._deferred_flush:
+            cls.flush()
+
+        cls._set_draw_color(color)
         sdl_points = [p.to_sdl_point() for p in points]
         points_ptr = (sdl2.SDL_Point * len(points))(*sdl_points)
-        sdl2.SDL_RenderDrawPoints(cls._sdl_renderer, points_ptr, len(points))
+        _SDL_RenderDrawPoints(cls._sdl_renderer, points_ptr, len(points))
 
     @classmethod
     def draw_line(cls, line: Line, color: Color) -> None:
         """ Draw a line. """
-        sdl2.SDL_SetRenderDrawColor(cls._sdl_renderer, *color)
-        sdl2.SDL_RenderDrawLine(cls._sdl_renderer, line.a.x, line.a.y, line.b.x, line.b.y)
+        if cls._deferred_flush:
+            cls.flush()
+
+        cls._set_draw_color(color)
+        _SDL_RenderDrawLine(cls._sdl_renderer, line.a.x, line.a.y, line.b.x, line.b.y)
 
     @classmethod
     def draw_thick_line(cls, line: Line, thickness: int, color: Color) -> None:
         """ Draw a line with thickness. """
-        sdl2.SDL_SetRenderDrawColor(cls._sdl_renderer, *color)
-        sdlgfx.thickLineRGBA(cls._sdl_renderer, line.a.x, line.a.y, line.b.x, line.b.y, thickness, *color)
+        if cls._deferred_flush:
+            cls.flush()
+
+        _thickLineRGBA(
+            cls._sdl_renderer, line.a.x, line.a.y, line.b.x, line.b.y, thickness, color.r, color.g, color.b, color.a
+        )
+        cls._invalidate_draw_state()
 
     @classmethod
     def draw_rect_outline(cls, rect: Rect, color: Color) -> None:
         """ Draw the outline of a rectangle. """
-        sdl2.SDL_SetRenderDrawColor(cls._sdl_renderer, *color)
-        sdl2.SDL_RenderDrawRect(cls._sdl_renderer, rect.to_sdl_rect())
+        if cls._deferred_flush:
+            cls.flush()
+
+        cls._set_draw_color(color)
+        _SDL_RenderDrawRect(cls._sdl_renderer, rect.to_sdl_rect())
 
     @classmethod
     def draw_rect_solid(cls, rect: Rect, color: Color) -> None:
         """ Draw a solid rectangle. """
-        sdl2.SDL_SetRenderDrawColor(cls._sdl_renderer, *color)
-        sdl2.SDL_RenderFillRect(cls._sdl_renderer, rect.to_sdl_rect())
+        if cls._deferred_flush:
+            cls.flush()
+
+        cls._set_draw_color(color)
+        _SDL_RenderFillRect(cls._sdl_renderer, rect.to_sdl_rect())
+
+    @classmethod
+    def draw_rects_outline(cls, rects: list[Rect], color: Color) -> None:
+        """ Draw the outlines of a list of rectangles in a single call. """
+        if cls._deferred_flush:
+            cls.flush()
+
+        count = len(rects)
+        cls._set_draw_color(color)
+        _SDL_RenderDrawRects(cls._sdl_renderer, cls._fill_rect_buffer(rects), count)
+
+    @classmethod
+    def draw_rects_solid(cls, rects: list[Rect], color: Color) -> None:
+        """ Draw a list of solid rectangles in a single call. """
+        if cls._deferred_flush:
+            cls.flush()
+
+        count = len(rects)
+        cls._set_draw_color(color)
+        _SDL_RenderFillRects(cls._sdl_renderer, cls._fill_rect_buffer(rects), count)
 
     @classmethod
     def draw_rounded_rect_outline(cls, rect: Rect, radius: int, color: Color) -> None:
         """ Draw the outline of a rectangle with rounded corners. """
-        sdlgfx.roundedRectangleRGBA(cls._sdl_renderer, rect.right(), rect.y, rect.x, rect.bottom(), radius, *color)
+        if cls._deferred_flush:
+            cls.flush()
+
+        _roundedRectangleRGBA(
+            cls._sdl_renderer, rect.right(), rect.y, rect.x, rect.bottom(), radius, color.r, color.g, color.b, color.a
+        )
+        cls._invalidate_draw_state()
 
     @classmethod
     def draw_rounded_rect_solid(cls, rect: Rect, radius: int, color: Color) -> None:
         """ Draw a solid rectangle with rounded corners. """
-        sdlgfx.roundedBoxRGBA(cls._sdl_renderer, rect.right(), rect.y, rect.x, rect.bottom(), radius, *color)
-
-        # Also draw the outline version.
-        # For some reason, the roundedBox edges don't match up with the roundedRectangle edges.
-        # Drawing both ensures that the outline for both is the same.
-        sdlgfx.roundedRectangleRGBA(cls._sdl_renderer, rect.right(), rect.y, rect.x, rect.bottom(), radius, *color)
+        cls._draw_rounded_rect_geometry(rect, radius, True, True, True, True, color)
 
     @classmethod
     def draw_rect_with_optional_rounded_corners_solid(cls,
@@ -238,42 +474,165 @@ class Renderer:
         """ Draw a solid rectangle.
         Each corner can be rounded (if True) or right-angle (if False).
         """
-        # Draw rounded rectangle
-        sdlgfx.roundedBoxRGBA(cls._sdl_renderer, rect.right(), rect.y, rect.x, rect.bottom(), radius, *color)
-        sdlgfx.roundedRectangleRGBA(cls._sdl_renderer, rect.right(), rect.y, rect.x, rect.bottom(), radius, *color)
-
-        # Draw corners
-        sdl2.SDL_SetRenderDrawColor(cls._sdl_renderer, *color)
-        if not top_left:
-            sdl2.SDL_RenderFillRect(
-                cls._sdl_renderer,
-                sdl2.SDL_Rect(rect.left(), rect.top(), radius, radius)
-            )
-        if not top_right:
-            sdl2.SDL_RenderFillRect(
-                cls._sdl_renderer,
-                sdl2.SDL_Rect(rect.right() - radius + 1, rect.top(), radius, radius)
-            )
-        if not bottom_left:
-            sdl2.SDL_RenderFillRect(
-                cls._sdl_renderer,
-                sdl2.SDL_Rect(rect.left(), rect.bottom() - radius + 1, radius, radius)
-            )
-        if not bottom_right:
-            sdl2.SDL_RenderFillRect(
-                cls._sdl_renderer,
-                sdl2.SDL_Rect(rect.right() - radius + 1, rect.bottom() - radius + 1, radius, radius)
-            )
+        cls._draw_rounded_rect_geometry(rect, radius, top_left, top_right, bottom_left, bottom_right, color)
 
     @classmethod
     def draw_circle_outline(cls, circle: Circle, color: Color) -> None:
         """ Draw the outline of a circle. """
-        sdlgfx.circleRGBA(cls._sdl_renderer, circle.x, circle.y, circle.radius, *color)
+        if cls._deferred_flush:
+            cls.flush()
+
+        _circleRGBA(cls._sdl_renderer, circle.x, circle.y, circle.radius, color.r, color.g, color.b, color.a)
+        cls._invalidate_draw_state()
 
     @classmethod
     def draw_circle_solid(cls, circle: Circle, color: Color) -> None:
         """ Draw a solid circle. """
-        sdlgfx.filledCircleRGBA(cls._sdl_renderer, circle.x, circle.y, circle.radius, *color)
+        if cls._deferred_flush:
+            cls.flush()
+
+        _filledCircleRGBA(
+            cls._sdl_renderer, circle.x, circle.y, circle.radius, color.r, color.g, color.b, color.a
+        )
+        cls._invalidate_draw_state()
+
+    @classmethod
+    def _set_draw_color(cls, color: Color) -> None:
+        """ Set the color used for drawing operations, skipping the SDL call if it hasn't changed. """
+        r, g, b, a = color.r, color.g, color.b, color.a
+        rgba = (r, g, b, a)
+        if rgba != cls._last_draw_color:
+            cls._last_draw_color = rgba
+            _SDL_SetRenderDrawColor(cls._sdl_renderer, r, g, b, a)
+
+    @classmethod
+    def _set_draw_blend_mode(cls, sdl_blend_mode: int) -> None:
+        """ Set the SDL blend mode used for drawing operations, skipping the SDL call if it hasn't changed. """
+        if sdl_blend_mode != cls._last_draw_blend_mode:
+            cls._last_draw_blend_mode = sdl_blend_mode
+            _SDL_SetRenderDrawBlendMode(cls._sdl_renderer, sdl_blend_mode)
+
+    @classmethod
+    def _fill_rect_buffer(cls, rects: list[Rect]) -> Array[sdl2.SDL_Rect]:
+        """ Copy a list of rectangles into the shared SDL_Rect buffer, growing it if needed. """
+        count = len(rects)
+        if count > len(cls._rect_buffer):
+            cls._rect_buffer = (sdl2.SDL_Rect * max(count, len(cls._rect_buffer) * 2))()
+
+        buffer = cls._rect_buffer
+        for i, rect in enumerate(rects):
+            sdl_rect = buffer[i]
+            sdl_rect.x = rect.x
+            sdl_rect.y = rect.y
+            sdl_rect.w = rect.width
+            sdl_rect.h = rect.height
+
+        return buffer
+
+    @classmethod
+    def _draw_rounded_rect_geometry(cls,
+                                    rect: Rect,
+                                    radius: int,
+                                    top_left: bool,
+                                    top_right: bool,
+                                    bottom_left: bool,
+                                    bottom_right: bool,
+                                    color: Color,
+                                    ) -> None:
+        """ Draw a solid rectangle with optionally rounded corners as a single geometry submission.
+        The triangles for each size, radius and corner combination are built once and cached.
+        """
+        if cls._deferred_flush:
+            cls.flush()
+
+        key = (rect.width, rect.height, radius, top_left, top_right, bottom_left, bottom_right)
+        if not (geometry := cls._rounded_rect_geometry_cache.get(key)):
+            geometry = cls._build_rounded_rect_geometry(*key)
+            cls._rounded_rect_geometry_cache[key] = geometry
+
+        # Move the cached vertices into place
+        positions, vertices, indices = geometry
+        x = rect.x
+        y = rect.y
+        sdl_color = sdl2.SDL_Color(color.r, color.g, color.b, color.a)
+        for vertex, (vx, vy) in zip(vertices, positions):
+            vertex.position.x = x + vx
+            vertex.position.y = y + vy
+            vertex.color = sdl_color
+
+        # Untextured geometry uses the draw blend mode; match SDL_gfx, which blends only translucent colors.
+        cls._set_draw_blend_mode(sdl2.SDL_BLENDMODE_BLEND if color.a < 255 else sdl2.SDL_BLENDMODE_NONE)
+        _SDL_RenderGeometry(cls._sdl_renderer, None, vertices, len(vertices), indices, len(indices))
+
+    @staticmethod
+    def _build_rounded_rect_geometry(width: int,
+                                     height: int,
+                                     radius: int,
+                                     top_left: bool,
+                                     top_right: bool,
+                                     bottom_left: bool,
+                                     bottom_right: bool,
+                                     ) -> tuple[list[tuple[int, int]], Array[sdl2.SDL_Vertex], Array[c_int]]:
+        """ Triangulate a rectangle with optionally rounded corners.
+        Each run of rows with the same left and right insets becomes a quad, so the shape is covered exactly once.
+        """
+        radius = min(radius, (width - 1) // 2, (height - 1) // 2)
+        if radius <= 1:
+            radius = 0
+
+        # Trace one octant of the corner arc with the midpoint circle algorithm, to find the half-width of each row
+        half_widths = {}
+        cx, cy = 0, radius
+        df, d_e, d_se = 1 - radius, 3, 5 - 2 * radius
+        while cx <= cy:
+            half_widths[cy] = max(half_widths.get(cy, 0), cx)
+            half_widths[cx] = max(half_widths.get(cx, 0), cy)
+            if df < 0:
+                df += d_e
+                d_se += 2
+            else:
+                df += d_se
+                d_se += 4
+                cy -= 1
+            d_e += 2
+            cx += 1
+        insets = [radius - half_widths.get(radius - row, radius) for row in range(radius)]
+
+        # Find the left and right inset of every row, and merge matching rows into runs
+        runs = []
+        for row in range(height):
+            left = right = 0
+            if row < radius:
+                left = insets[row] if top_left else 0
+                right = insets[row] if top_right else 0
+            elif row >= height - radius:
+                left = insets[height - 1 - row] if bottom_left else 0
+                right = insets[height - 1 - row] if bottom_right else 0
+
+            if runs and runs[-1][0] == left and runs[-1][1] == right:
+                runs[-1][3] = row + 1
+            else:
+                runs.append([left, right, row, row + 1])
+
+        # Two triangles per run
+        positions = []
+        index_list = []
+        for left, right, top, bottom in runs:
+            i = len(positions)
+            positions.extend([(left, top), (width - right, top), (width - right, bottom), (left, bottom)])
+            index_list.extend([i, i + 1, i + 2, i + 2, i + 3, i])
+
+        vertices = (sdl2.SDL_Vertex * len(positions))()
+        indices = (c_int * len(index_list))(*index_list)
+        return positions, vertices, indices
+
+    @classmethod
+    def _invalidate_draw_state(cls) -> None:
+        """ Forget the cached draw color and blend mode.
+        SDL_gfx functions set the draw color and blend mode themselves, so this must be called after using them.
+        """
+        cls._last_draw_color = None
+        cls._last_draw_blend_mode = None
 
     @classmethod
     def render_geometry(cls, vertices: list[Point], color: Color) -> None:
@@ -285,9 +644,12 @@ class Renderer:
                     └────────────────────┬────────────────────┘  └────────────────────┬────────────────────┘
                                      Triangle 1                                   Triangle 2
         """
+        if cls._deferred_flush:
+            cls.flush()
+
         sdl_vertices = [sdl2.SDL_Vertex((v.x, v.y), color.to_tuple()) for v in vertices]
         vertices_ptr = (sdl2.SDL_Vertex * len(vertices))(*sdl_vertices)
-        sdl2.SDL_RenderGeometry(cls._sdl_renderer, None, vertices_ptr, len(vertices), None, 0)
+        _SDL_RenderGeometry(cls._sdl_renderer, None, vertices_ptr, len(vertices), None, 0)
 
     @classmethod
     def add_reset_callback(cls, callback: Callable) -> None:
@@ -302,6 +664,8 @@ class Renderer:
     @classmethod
     def on_renderer_reset(cls) -> None:
         """ Called when the render targets or device has been reset. """
+        cls._invalidate_draw_state()
+        cls._reapply_texture_mods()
         cls._reset_callbacks.execute_callbacks()
 
     @classmethod
@@ -324,24 +688,27 @@ class Renderer:
         """ Set the blend mode used for drawing operations (Fill and Line). """
         match blend_mode:
             case BlendMode.NONE:
-                sdl2.SDL_SetRenderDrawBlendMode(cls._sdl_renderer, sdl2.SDL_BLENDMODE_NONE)
+                cls._set_draw_blend_mode(sdl2.SDL_BLENDMODE_NONE)
             case BlendMode.BLEND:
-                sdl2.SDL_SetRenderDrawBlendMode(cls._sdl_renderer, sdl2.SDL_BLENDMODE_BLEND)
+                cls._set_draw_blend_mode(sdl2.SDL_BLENDMODE_BLEND)
             case BlendMode.ADD:
-                sdl2.SDL_SetRenderDrawBlendMode(cls._sdl_renderer, sdl2.SDL_BLENDMODE_ADD)
+                cls._set_draw_blend_mode(sdl2.SDL_BLENDMODE_ADD)
             case BlendMode.MOD:
-                sdl2.SDL_SetRenderDrawBlendMode(cls._sdl_renderer, sdl2.SDL_BLENDMODE_MOD)
+                cls._set_draw_blend_mode(sdl2.SDL_BLENDMODE_MOD)
             case BlendMode.MUL:
-                sdl2.SDL_SetRenderDrawBlendMode(cls._sdl_renderer, sdl2.SDL_BLENDMODE_MUL)
+                cls._set_draw_blend_mode(sdl2.SDL_BLENDMODE_MUL)
 
     @classmethod
     def clear_render_draw_blend_mode(cls) -> None:
         """ Clear the render draw blend mode. """
-        sdl2.SDL_SetRenderDrawBlendMode(cls._sdl_renderer, sdl2.SDL_BLENDMODE_NONE)
+        cls._set_draw_blend_mode(sdl2.SDL_BLENDMODE_NONE)
 
     @classmethod
     def write_png(cls, file: Path) -> None:
         """ Write the image from the current rendering target to a PNG. """
+        if cls._deferred_flush:
+            cls.flush()
+
         # Get the width and height of the current render target
         width = c_int()
         height = c_int()
@@ -370,19 +737,49 @@ class Renderer:
     @staticmethod
     def set_texture_color_mod(texture: Texture, color: Color) -> None:
         """ Set an additional color value multiplied into render copy operations. """
-        sdl2.SDL_SetTextureColorMod(texture.sdl_texture, color.r, color.g, color.b)
+        rgb = (color.r, color.g, color.b)
+        if Renderer._texture_color_mods.get(texture, _NO_COLOR_MOD) == rgb:
+            return
+
+        if Renderer._deferred_flush:
+            Renderer.flush()
+
+        _SDL_SetTextureColorMod(texture.sdl_texture, color.r, color.g, color.b)
+        Renderer._texture_color_mods[texture] = rgb
 
     @staticmethod
     def clear_texture_color_mod(texture: Texture) -> None:
         """ Clear the texture's color mod. """
-        sdl2.SDL_SetTextureColorMod(texture.sdl_texture, 255, 255, 255)
+        if Renderer._texture_color_mods.get(texture, _NO_COLOR_MOD) == _NO_COLOR_MOD:
+            return
+
+        if Renderer._deferred_flush:
+            Renderer.flush()
+
+        _SDL_SetTextureColorMod(texture.sdl_texture, 255, 255, 255)
+        Renderer._texture_color_mods[texture] = _NO_COLOR_MOD
 
     @staticmethod
     def set_texture_alpha_mod(texture: Texture, alpha: int) -> None:
         """ Set an additional alpha value multiplied into render copy operations """
-        sdl2.SDL_SetTextureAlphaMod(texture.sdl_texture, alpha)
+        if Renderer._texture_alpha_mods.get(texture, 255) == alpha:
+            return
+
+        if Renderer._deferred_flush:
+            Renderer.flush()
+
+        _SDL_SetTextureAlphaMod(texture.sdl_texture, alpha)
+        Renderer._texture_alpha_mods[texture] = alpha
 
     @staticmethod
     def clear_texture_alpha_mod(texture: Texture) -> None:
         """ Clear the texture alpha mod. """
-        sdl2.SDL_SetTextureAlphaMod(texture.sdl_texture, 255)
+        Renderer.set_texture_alpha_mod(texture, 255)
+
+    @classmethod
+    def _reapply_texture_mods(cls) -> None:
+        """ Push the tracked texture mods to SDL again, so that SDL and the tracked state can't disagree. """
+        for texture, (r, g, b) in list(cls._texture_color_mods.items()):
+            _SDL_SetTextureColorMod(texture.sdl_texture, r, g, b)
+        for texture, alpha in list(cls._texture_alpha_mods.items()):
+            _SDL_SetTextureAlphaMod(texture.sdl_texture, alpha)
@@ -96,6 +96,19 @@ class Scene:
         """ Get a level by name. """
         return self._level_map.get(level_name)
 
+    def activate_only_level(self, index: int) -> None:
+        """ Activate the entities in the level at `index`, and deactivate the entities in every other level.
+        The changes are queued for the whole scene at once, instead of level by level.
+        """
+        active = []
+        inactive = []
+        for i, level in enumerate(self.levels):
+            entities = active if i == index else inactive
+            entities.extend(entity for entity in level.entities if entity.scene is self)
+
+        self.entities.set_many_active(active, True)
+        self.entities.set_many_active(inactive, False)
+
     def setup_cameras(self) -> None:
         """ Use this to add cameras to the scene and/or change camera settings.
         This is called right before `load_entities`.
@@ -151,3 +164,10 @@ class Scene:
     def end(self) -> None:
         """ Called before the engine loads the next scene. """
         pass
+
+    def teardown(self) -> None:
+        """ Called after `end`, to drop the scene's references to its entities and levels so that they can be freed
+            before the next scene loads.
+        """
+        self.entities.clear()
+        self._level_map.clear()
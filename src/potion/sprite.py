@@ -16,60 +16,127 @@ from potion.data_types.rect import Rect
 from potion.frame import Frame
 from potion.log import Log
 from potion.renderer import Renderer
-from potion.utilities import pmath
+from potion.sprite_batch import SpriteBatch
 
 if TYPE_CHECKING:
     from potion.camera import Camera
 
 
+# Color of the flash mask
+_WHITE = Color.white()
+
+
 class Sprite:
     """ A 2D sprite object. """
-    def __init__(self, content_path: str) -> None:
-        """ `content_path` is the path to the sprite image texture file. """
+    __slots__ = (
+        "_name",
+        "_rotation",
+        "_scale",
+        "_is_unit_scale",
+        "_pivot",
+        "_flip_horizontal",
+        "_flip_vertical",
+        "_flip",
+        "_color",
+        "_opacity",
+        "_flash_color",
+        "_flash_opacity",
+        "_flash_additive",
+        "_texture",
+        "_source_rect",
+        "_sdl_source_rect",
+        "_flash_full_rect",
+        "_flash_full_sdl_rect",
+        "_unscaled_width",
+        "_unscaled_height",
+        "_atlas",
+        "_frame_offset_top",
+        "_frame_offset_left",
+        "_frame_offset_right",
+        "_frame_offset_bottom",
+        "_frame_offsets_x",
+        "_frame_offsets_y",
+        "_dirty",
+        "_cached_pivot_offset_x",
+        "_cached_pivot_offset_y",
+        "_cached_frame_offset_x",
+        "_cached_frame_offset_y",
+        "_cached_destination_w",
+        "_cached_destination_h",
+        "_cached_rotation_center",
+        "__weakref__",
+    )
+
+    # SDL flip flags, indexed by `flip_horizontal + 2 * flip_vertical`
+    _FLIP_LUT = (0, sdl2.SDL_FLIP_HORIZONTAL, sdl2.SDL_FLIP_VERTICAL, sdl2.SDL_FLIP_HORIZONTAL | sdl2.SDL_FLIP_VERTICAL)
+
+    # Render target that all sprites share to build their flash masks; it grows to fit the largest flashing sprite
+    _SHARED_FLASH_TEXTURE: Texture | None = None
+    _SHARED_FLASH_W = 0
+    _SHARED_FLASH_H = 0
+
+    def __init__(self, content_path: str, frame: Frame | None = None) -> None:
+        """ `content_path` is the path to the sprite image texture file.
+        If `frame` is given, the sprite draws that frame of the texture (see `from_atlas` and `from_frame`).
+        """
         self._name = content_path
         self._rotation = 0
         self._scale = 1.0
+        self._is_unit_scale = True
         self._pivot = Pivot()
         self._flip_horizontal = False
         self._flip_vertical = False
         self._flip = 0
         self._color = None
         self._opacity = 255
-        self._flash_texture = Texture.create_target(2, 2)
         self._flash_color = Color.white()
         self._flash_opacity = 0
+        self._flash_additive = False
 
         if content_path == "empty-sprite":
             self._texture = Texture.create_static(0, 0)
         else:
             self._texture = Content.load_texture(content_path)
 
-        # Set the source rect for drawing
-        self._source_rect: Rect = Rect(0, 0, self._texture.width, self._texture.height)
-
-        # Store the unscaled size of the original texture
-        # The real width and height of the sprite may change if a scale is applied
-        self._unscaled_width = self._texture.width
-        self._unscaled_height = self._texture.height
-
         # Track the atlas that the sprite came from (if any)
         self._atlas: Atlas | None = None
 
-        # Optional frame data for sprites that are loaded from an atlas
-        self._frame_offset_top: int = 0
-        self._frame_offset_left: int = 0
-        self._frame_offset_right: int = 0
-        self._frame_offset_bottom: int = 0
-        self._frame_offset: Point = Point.zero()
-
-        # Initialize flash texture
-        self._reset_flash_texture()
-
-        # Callbacks
-        Renderer.add_reset_callback(self._reset_flash_texture)
-
-    def __del__(self) -> None:
-        Renderer.remove_reset_callback(self._reset_flash_texture)
+        if frame is not None:
+            # Use the part of the texture described by the frame data
+            self._apply_frame_data(frame)
+        else:
+            # Set the source rect for drawing
+            self._source_rect: Rect = Rect(0, 0, self._texture.width, self._texture.height)
+            self._sdl_source_rect: sdl2.SDL_Rect = self._source_rect.to_sdl_rect()
+
+            # The area of the shared flash texture that the flash mask is drawn to
+            self._flash_full_rect = Rect(0, 0, self._source_rect.width, self._source_rect.height)
+            self._flash_full_sdl_rect = self._flash_full_rect.to_sdl_rect()
+
+            # Store the unscaled size of the original texture
+            # The real width and height of the sprite may change if a scale is applied
+            self._unscaled_width = self._texture.width
+            self._unscaled_height = self._texture.height
+
+            # Optional frame data for sprites that are loaded from an atlas
+            self._frame_offset_top: int = 0
+            self._frame_offset_left: int = 0
+            self._frame_offset_right: int = 0
+            self._frame_offset_bottom: int = 0
+
+            # The scaled frame offsets, as (not flipped, flipped) pairs
+            self._frame_offsets_x: tuple[int, int] = (0, 0)
+            self._frame_offsets_y: tuple[int, int] = (0, 0)
+
+        # Cached values used while drawing; these are recomputed when `_dirty` is set
+        self._dirty = True
+        self._cached_pivot_offset_x = 0
+        self._cached_pivot_offset_y = 0
+        self._cached_frame_offset_x = 0
+        self._cached_frame_offset_y = 0
+        self._cached_destination_w = 0
+        self._cached_destination_h = 0
+        self._cached_rotation_center: tuple[int, int] = (0, 0)
 
     def __str__(self) -> str:
         return f"Sprite({self.name})"
@@ -98,6 +165,9 @@ class Sprite:
     @scale.setter
     def scale(self, value: float) -> None:
         self._scale = value
+        self._is_unit_scale = value == 1.0
+        self._update_frame_offsets()
+        self._dirty = True
     
     @property
     def rotation(self) -> int:
@@ -111,6 +181,8 @@ class Sprite:
     @property
     def pivot(self) -> Pivot:
         """ The pivot point of the sprite. """
+        # The pivot is changed through the returned object, so assume that it will be modified
+        self._dirty = True
         return self._pivot
 
     @property
@@ -121,12 +193,8 @@ class Sprite:
     @flip_horizontal.setter
     def flip_horizontal(self, value: bool) -> None:
         self._flip_horizontal = value
-
-        self._flip = 0
-        if self._flip_horizontal:
-            self._flip |= sdl2.SDL_FLIP_HORIZONTAL
-        if self._flip_vertical:
-            self._flip |= sdl2.SDL_FLIP_VERTICAL
+        self._flip = Sprite._FLIP_LUT[bool(self._flip_horizontal) + 2 * bool(self._flip_vertical)]
+        self._dirty = True
 
     @property
     def flip_vertical(self) -> bool:
@@ -136,12 +204,8 @@ class Sprite:
     @flip_vertical.setter
     def flip_vertical(self, value: bool) -> None:
         self._flip_vertical = value
-
-        self._flip = 0
-        if self._flip_horizontal:
-            self._flip |= sdl2.SDL_FLIP_HORIZONTAL
-        if self._flip_vertical:
-            self._flip |= sdl2.SDL_FLIP_VERTICAL
+        self._flip = Sprite._FLIP_LUT[bool(self._flip_horizontal) + 2 * bool(self._flip_vertical)]
+        self._dirty = True
 
     @property
     def color(self) -> Color | None:
@@ -163,7 +227,7 @@ class Sprite:
     @opacity.setter
     def opacity(self, value: int) -> None:
         """ Opacity can be set as a 0-255 int value. """
-        self._opacity = pmath.clamp(value, 0, 255)
+        self._opacity = 0 if value < 0 else (255 if value > 255 else value)
 
     @property
     def flash_color(self) -> Color:
@@ -186,7 +250,19 @@ class Sprite:
         """ Opacity can be set as a 0-255 int value.
         Setting the opacity to 0 removes the flash.
         """
-        self._flash_opacity = pmath.clamp(value, 0, 255)
+        self._flash_opacity = 0 if value < 0 else (255 if value > 255 else value)
+
+    @property
+    def flash_additive(self) -> bool:
+        """ If true, the flash is drawn as a single additive copy of the sprite, tinted by the flash color.
+        This skips building a mask on a render target, so it's cheaper; but it brightens the sprite's own colors
+        instead of covering them, so it only approximates the default flash.
+        """
+        return self._flash_additive
+
+    @flash_additive.setter
+    def flash_additive(self, value: bool) -> None:
+        self._flash_additive = value
 
     @classmethod
     def from_atlas(cls, content_path: str, sprite_name: str) -> Sprite:
@@ -194,10 +270,6 @@ class Sprite:
         `content_path` is the path to the sprite atlas texture file.
         `sprite_name` can be either a frame name ("MySprite.0001") or the sprite's original filename ("MySprite").
         """
-        # Create sprite
-        sprite = cls(content_path)
-        sprite._name = sprite_name
-
         # Create atlas
         atlas = Atlas.instance(content_path)
 
@@ -208,11 +280,12 @@ class Sprite:
             frame = atlas.animation_frames(sprite_name, "default")[0]
         else:
             Log.error(f"Could not find frame or sprite named '{sprite_name}' in {atlas}")
-            return sprite.empty()
+            return cls.empty()
 
-        # Apply frame data to sprite
+        # Create sprite from the frame data
+        sprite = cls(content_path, frame)
+        sprite._name = sprite_name
         sprite._atlas = atlas
-        sprite._apply_frame_data(frame)
 
         return sprite
 
@@ -221,9 +294,7 @@ class Sprite:
         """ Factory method to create a sprite from a frame.
         `content_path` is the path to the sprite image texture file.
         """
-        sprite = Sprite(content_path)
-        sprite._apply_frame_data(frame)
-        return sprite
+        return Sprite(content_path, frame)
 
     @classmethod
     def empty(cls) -> Sprite:
@@ -236,10 +307,14 @@ class Sprite:
 
     def width(self) -> int:
         """ The width of the sprite. """
+        if self._is_unit_scale:
+            return self._unscaled_width
         return floor(self._unscaled_width * self.scale)
 
     def height(self) -> int:
         """ The height of the sprite. """
+        if self._is_unit_scale:
+            return self._unscaled_height
         return floor(self._unscaled_height * self.scale)
 
     def pivot_offset(self) -> Point:
@@ -260,16 +335,8 @@ class Sprite:
 
         This offset will always be zero if the sprite wasn't loaded from frame data.
         """
-        if self.flip_horizontal:
-            x = self._frame_offset_right * self._scale
-        else:
-            x = self._frame_offset_left * self._scale
-
-        if self.flip_vertical:
-            y = self._frame_offset_bottom * self._scale
-        else:
-            y = self._frame_offset_top * self._scale
-
+        x = self._frame_offsets_x[1 if self._flip_horizontal else 0]
+        y = self._frame_offsets_y[1 if self._flip_vertical else 0]
         return Point(x, y)
 
     def set_texture_blend_mode(self, blend_mode: BlendMode) -> None:
@@ -284,85 +351,123 @@ class Sprite:
         # Convert world position to render position
         render_position = camera.world_to_render_position(position)
 
-        # Get draw position by applying offsets to the render position
-        draw_position = render_position - self.pivot_offset() + self.frame_offset()
-
-        # Set destination rect
-        destination_w = floor(self._source_rect.width * self._scale)
-        destination_h = floor(self._source_rect.height * self._scale)
-        destination = Rect(draw_position.x, draw_position.y, destination_w, destination_h)
-
-        # If there is rotation, calculate the center point
-        rotation_center = None
-        if self._rotation:
-            rotation_center = self.pivot_offset() - self.frame_offset()
-
-        # Apply tint
-        if self.color:
-            Renderer.set_texture_color_mod(self._texture, self.color)
-
-        # Apply opacity
-        if self.opacity != 255:
-            Renderer.set_texture_alpha_mod(self._texture, self.opacity)
+        if self._dirty:
+            self._recompute()
+
+        # Get the destination position by applying offsets to the render position
+        x = render_position.x - self._cached_pivot_offset_x + self._cached_frame_offset_x
+        y = render_position.y - self._cached_pivot_offset_y + self._cached_frame_offset_y
+        w = self._cached_destination_w
+        h = self._cached_destination_h
+
+        # If there is rotation, use the center point
+        rotation = self._rotation
+        rotation_center = self._cached_rotation_center if rotation else None
+        flip = self._flip
+
+        # Skip sprites that are out of view
+        if rotation:
+            # A rotated sprite stays within a square around its rotation center that reaches all of its corners
+            center_x, center_y = rotation_center
+            radius = abs(center_x) + abs(center_y) + w + h
+            if not camera.in_view(x + center_x - radius, y + center_y - radius, radius * 2, radius * 2):
+                return
+        elif not camera.in_view(x, y, w, h):
+            return
 
         # Render texture
-        Renderer.copy(
-            texture=self._texture,
-            source_rect=self._source_rect,
-            destination_rect=destination,
-            rotation_angle=self._rotation,
-            rotation_center=rotation_center,
-            flip=self._flip
+        # This runs for every sprite, every frame, so the arguments are passed positionally and read from the
+        # underlying attributes rather than through properties.
+        SpriteBatch.submit(
+            self._texture,
+            self._sdl_source_rect,
+            x,
+            y,
+            w,
+            h,
+            rotation,
+            rotation_center,
+            flip,
+            self._color,
+            self._opacity,
         )
 
-        # Clear tint
-        if self.color:
-            Renderer.clear_texture_color_mod(self._texture)
-
-        # Clear opacity
-        if self.opacity != 255:
-            Renderer.clear_texture_alpha_mod(self._texture)
-
         # Flash
         if not self._flash_opacity:
             return
 
+        if self._flash_additive:
+            self._draw_additive_flash(x, y, w, h, rotation, rotation_center, flip)
+            return
+
+        flash_rect = self._flash_full_rect
+        flash_texture = Sprite._ensure_flash_texture(flash_rect.width, flash_rect.height)
+
         # Create mask
         # 1. Clear the flash texture
         # 2. Draw the sprite to the flash texture
         # 3. Add white over the texture - this creates a full white mask
-        with Renderer.render_target(self._flash_texture):
+        with Renderer.render_target(flash_texture):
             Renderer.clear()
             Renderer.copy(
                 texture=self._texture,
                 source_rect=self._source_rect,
-                destination_rect=None,
+                destination_rect=flash_rect,
                 rotation_angle=0,
                 rotation_center=None,
                 flip=0,
             )
             Renderer.set_render_draw_blend_mode(BlendMode.ADD)
-            Renderer.draw_rect_solid(Rect(0, 0, self._source_rect.width, self._source_rect.height), Color.white())
+            Renderer.draw_rect_solid(flash_rect, _WHITE)
             Renderer.clear_render_draw_blend_mode()
 
         # Set color and opacity
-        Renderer.set_texture_color_mod(self._flash_texture, self._flash_color)
-        Renderer.set_texture_alpha_mod(self._flash_texture, self._flash_opacity)
+        Renderer.set_texture_color_mod(flash_texture, self._flash_color)
+        Renderer.set_texture_alpha_mod(flash_texture, self._flash_opacity)
 
         # Render flash texture
-        Renderer.copy(
-            texture=self._flash_texture,
-            source_rect=None,
-            destination_rect=destination,
-            rotation_angle=self.rotation,
+        Renderer.copy_raw(
+            texture=flash_texture,
+            source_rect=self._flash_full_sdl_rect,
+            x=x,
+            y=y,
+            width=w,
+            height=h,
+            rotation_angle=rotation,
             rotation_center=rotation_center,
-            flip=self._flip
+            flip=flip
         )
 
+    def _draw_additive_flash(self,
+                             x: int,
+                             y: int,
+                             w: int,
+                             h: int,
+                             rotation: int,
+                             rotation_center: tuple[int, int] | None,
+                             flip: int
+                             ) -> None:
+        """ Draw the flash by adding a tinted copy of the sprite on top of it. """
+        texture = self._texture
+        blend_mode = texture.blend_mode
+
+        Renderer.set_texture_color_mod(texture, self._flash_color)
+        Renderer.set_texture_alpha_mod(texture, self._flash_opacity)
+        texture.set_blend_mode(BlendMode.ADD)
+
+        Renderer.copy_raw(texture, self._sdl_source_rect, x, y, w, h, rotation, rotation_center, flip)
+
+        texture.set_blend_mode(blend_mode)
+        Renderer.clear_texture_color_mod(texture)
+        Renderer.clear_texture_alpha_mod(texture)
+
     def _apply_frame_data(self, frame: Frame):
         """ Read frame data from an atlas and apply it to the sprite. """
         # Set source rect
         self._source_rect = Rect(frame.x, frame.y, frame.frame_width, frame.frame_height)
+        self._sdl_source_rect = self._source_rect.to_sdl_rect()
+        self._flash_full_rect = Rect(0, 0, frame.frame_width, frame.frame_height)
+        self._flash_full_sdl_rect = self._flash_full_rect.to_sdl_rect()
 
         # Set unscaled width and height
         self._unscaled_width = frame.sprite_width
@@ -371,13 +476,57 @@ class Sprite:
         # Set frame offset
         self._frame_offset_top = frame.offset_y
         self._frame_offset_left = frame.offset_x
-        self._frame_offset_right = frame.sprite_width - frame.frame_width - frame.offset_x
-        self._frame_offset_bottom = frame.sprite_height - frame.frame_height - frame.offset_y
+        self._frame_offset_right = frame.offset_right
+        self._frame_offset_bottom = frame.offset_bottom
+        self._update_frame_offsets()
+        self._dirty = True
+
+    def _update_frame_offsets(self) -> None:
+        """ Scale the frame offsets for each flip direction. """
+        if self._is_unit_scale:
+            self._frame_offsets_x = (self._frame_offset_left, self._frame_offset_right)
+            self._frame_offsets_y = (self._frame_offset_top, self._frame_offset_bottom)
+        else:
+            scale = self._scale
+            self._frame_offsets_x = (floor(self._frame_offset_left * scale), floor(self._frame_offset_right * scale))
+            self._frame_offsets_y = (floor(self._frame_offset_top * scale), floor(self._frame_offset_bottom * scale))
+
+    def _recompute(self) -> None:
+        """ Recompute the cached values used while drawing. """
+        pivot_offset = self.pivot_offset()
+        frame_offset = self.frame_offset()
+
+        self._cached_pivot_offset_x = pivot_offset.x
+        self._cached_pivot_offset_y = pivot_offset.y
+        self._cached_frame_offset_x = frame_offset.x
+        self._cached_frame_offset_y = frame_offset.y
+        if self._is_unit_scale:
+            self._cached_destination_w = self._source_rect.width
+            self._cached_destination_h = self._source_rect.height
+        else:
+            self._cached_destination_w = floor(self._source_rect.width * self._scale)
+            self._cached_destination_h = floor(self._source_rect.height * self._scale)
+        self._cached_rotation_center = (pivot_offset.x - frame_offset.x, pivot_offset.y - frame_offset.y)
+
+        self._dirty = False
+
+    @classmethod
+    def _ensure_flash_texture(cls, width: int, height: int) -> Texture:
+        """ Get the shared flash texture, making sure that it's at least `width` x `height`. """
+        if cls._SHARED_FLASH_TEXTURE is None or width > cls._SHARED_FLASH_W or height > cls._SHARED_FLASH_H:
+            cls._SHARED_FLASH_W = max(cls._SHARED_FLASH_W, width)
+            cls._SHARED_FLASH_H = max(cls._SHARED_FLASH_H, height)
+            cls._SHARED_FLASH_TEXTURE = Texture.create_target(cls._SHARED_FLASH_W, cls._SHARED_FLASH_H)
+            cls._SHARED_FLASH_TEXTURE.set_blend_mode(BlendMode.BLEND)
+
+        return cls._SHARED_FLASH_TEXTURE
+
+    @classmethod
+    def _reset_flash_texture(cls) -> None:
+        """ Drop the shared flash texture; it will be recreated the next time a sprite flashes. """
+        cls._SHARED_FLASH_TEXTURE = None
+        cls._SHARED_FLASH_W = 0
+        cls._SHARED_FLASH_H = 0
 
-        # Reset the flash texture
-        self._reset_flash_texture()
 
-    def _reset_flash_texture(self) -> None:
-        """ Create the flash texture. """
-        self._flash_texture = Texture.create_target(self._source_rect.width, self._source_rect.height)
-        self._flash_texture.set_blend_mode(BlendMode.BLEND)
+Renderer.add_reset_callback(Sprite._reset_flash_texture)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from array import array
+from operator import add
+from typing import TYPE_CHECKING
+
+from potion.renderer import Renderer
+
+if TYPE_CHECKING:
+    import sdl2
+
+    from potion.camera import Camera
+    from potion.content_types.texture import Texture
+    from potion.data_types.color import Color
+    from potion.data_types.point import Point
+    from potion.sprite import Sprite
+
+
+class SpriteRenderArray:
+    """ Draw data for a large set of sprites (e.g. tiles or particles), stored as parallel arrays.
+
+    Sprites are appended with their position for the frame, and then drawn together with `draw`, which walks the
+    arrays in one loop instead of going through each sprite's `draw` method.
+
+    Flash overlays are not drawn; use `Sprite.draw` for sprites that flash.
+    """
+    def __init__(self) -> None:
+        # Render positions, and the pivot/frame offset from the render position to the top-left corner
+        self.pos_x = array("i")
+        self.pos_y = array("i")
+        self.offset_x = array("i")
+        self.offset_y = array("i")
+
+        # Destination rects; `dst_x` and `dst_y` are computed from the positions and offsets when drawing
+        self.dst_x = array("i")
+        self.dst_y = array("i")
+        self.dst_w = array("i")
+        self.dst_h = array("i")
+
+        # Rotation
+        self.rot = array("d")
+        self.center_x = array("i")
+        self.center_y = array("i")
+
+        # Flip flags
+        self.flip = array("i")
+
+        # Opacity
+        self.opacity = array("i")
+
+        # Index into `textures`
+        self.tex_id = array("i")
+
+        # Values that aren't plain numbers are kept in parallel lists
+        self.textures: list[Texture] = []
+        self.source_rects: list[sdl2.SDL_Rect] = []
+        self.colors: list[Color | None] = []
+
+        self._texture_ids: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.pos_x)
+
+    def append(self, sprite: Sprite, position: Point, camera: Camera) -> None:
+        """ Add a sprite to be drawn at a world position. """
+        render_position = camera.world_to_render_position(position)
+
+        if sprite._dirty:
+            sprite._recompute()
+
+        # Get the texture id
+        texture = sprite._texture
+        tex_id = self._texture_ids.get(id(texture))
+        if tex_id is None:
+            tex_id = len(self.textures)
+            self._texture_ids[id(texture)] = tex_id
+            self.textures.append(texture)
+
+        self.pos_x.append(render_position.x)
+        self.pos_y.append(render_position.y)
+        self.offset_x.append(sprite._cached_frame_offset_x - sprite._cached_pivot_offset_x)
+        self.offset_y.append(sprite._cached_frame_offset_y - sprite._cached_pivot_offset_y)
+        self.dst_w.append(sprite._cached_destination_w)
+        self.dst_h.append(sprite._cached_destination_h)
+
+        center_x, center_y = sprite._cached_rotation_center
+        self.rot.append(sprite._rotation)
+        self.center_x.append(center_x)
+        self.center_y.append(center_y)
+
+        self.flip.append(sprite._flip)
+        self.opacity.append(sprite._opacity)
+        self.tex_id.append(tex_id)
+
+        self.source_rects.append(sprite._sdl_source_rect)
+        self.colors.append(sprite._color)
+
+    def clear(self) -> None:
+        """ Remove all sprites from the array. """
+        for values in (
+                self.pos_x, self.pos_y, self.offset_x, self.offset_y,
+                self.dst_x, self.dst_y, self.dst_w, self.dst_h,
+                self.rot, self.center_x, self.center_y,
+                self.flip, self.opacity, self.tex_id,
+                self.textures, self.source_rects, self.colors,
+        ):
+            del values[:]
+
+        self._texture_ids.clear()
+
+    def draw(self) -> None:
+        """ Draw every sprite in the array, in the order that they were added. """
+        if not self.pos_x:
+            return
+
+        self._compute_destinations()
+
+        textures = self.textures
+        source_rects = self.source_rects
+        colors = self.colors
+        dst_x = self.dst_x
+        dst_y = self.dst_y
+        dst_w = self.dst_w
+        dst_h = self.dst_h
+        rot = self.rot
+        center_x = self.center_x
+        center_y = self.center_y
+        flip = self.flip
+        opacity = self.opacity
+        tex_id = self.tex_id
+
+        copy_plain = Renderer.copy_plain
+        copy_raw = Renderer.copy_raw
+
+        run_texture = None
+        run_color = None
+        run_opacity = 255
+        modded_textures = set()
+
+        for i in range(len(dst_x)):
+            texture = textures[tex_id[i]]
+            color = colors[i]
+
+            # Set the mods when they change; the renderer skips mods that are already set on the texture
+            if texture is not run_texture or color is not run_color or opacity[i] != run_opacity:
+                if color:
+                    Renderer.set_texture_color_mod(texture, color)
+                else:
+                    Renderer.clear_texture_color_mod(texture)
+                Renderer.set_texture_alpha_mod(texture, opacity[i])
+
+                if color or opacity[i] != 255:
+                    modded_textures.add(texture)
+
+                run_texture = texture
+                run_color = color
+                run_opacity = opacity[i]
+
+            if rot[i] or flip[i]:
+                rotation_center = (center_x[i], center_y[i]) if rot[i] else None
+                copy_raw(texture, source_rects[i], dst_x[i], dst_y[i], dst_w[i], dst_h[i], rot[i], rotation_center, flip[i])
+            else:
+                copy_plain(texture, source_rects[i], dst_x[i], dst_y[i], dst_w[i], dst_h[i])
+
+        # Leave the textures without mods for anything else that draws them
+        for texture in modded_textures:
+            Renderer.clear_texture_color_mod(texture)
+            Renderer.clear_texture_alpha_mod(texture)
+
+    def _compute_destinations(self) -> None:
+        """ Compute the destination positions for every sprite in one pass. """
+        self.dst_x = array("i", map(add, self.pos_x, self.offset_x))
+        self.dst_y = array("i", map(add, self.pos_y, self.offset_y))
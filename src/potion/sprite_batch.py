@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import sdl2
+
+from potion.renderer import Renderer
+
+if TYPE_CHECKING:
+    from potion.content_types.texture import Texture
+    from potion.data_types.color import Color
+
+
+# Keep the submission order; consecutive draws that share a texture, tint and opacity are submitted as one run.
+SORT_MODE_DEFERRED = 0
+
+# Sort by texture and blend mode before submitting.
+# This changes the draw order, so it should only be used for sprites that don't overlap (e.g. tiles).
+SORT_MODE_TEXTURE = 1
+
+
+class SpriteBatch:
+    """ Defers sprite draws, and submits them in runs that share the same texture state.
+    The color and alpha mods are set once at the start of each run, and cleared once per texture at the end of the
+    batch, instead of around every copy.
+
+    The batch is flushed automatically before any other rendering operation, so draw order is preserved.
+    """
+    _sort_mode = SORT_MODE_DEFERRED
+    _entries: list[tuple] = []
+
+    @classmethod
+    def begin(cls, sort_mode: int = SORT_MODE_DEFERRED) -> None:
+        """ Start a batch with the given sort mode. """
+        Renderer.flush()
+        cls._sort_mode = sort_mode
+
+    @classmethod
+    def end(cls) -> None:
+        """ Submit the batch, and go back to the default sort mode. """
+        Renderer.flush()
+        cls._sort_mode = SORT_MODE_DEFERRED
+
+    @classmethod
+    def submit(cls,
+               texture: Texture,
+               source_rect: sdl2.SDL_Rect | None,
+               x: int,
+               y: int,
+               width: int,
+               height: int,
+               rotation_angle: float,
+               rotation_center: tuple[int, int] | None,
+               flip: int,
+               color: Color | None,
+               opacity: int,
+               ) -> None:
+        """ Add a texture copy to the batch.
+        The source rect is an SDL_Rect, and the destination rect and rotation center are given as ints (see
+        `Renderer.copy_raw`).
+        """
+        if not cls._entries:
+            Renderer.defer(cls.flush)
+
+        cls._entries.append(
+            (texture, source_rect, x, y, width, height, rotation_angle, rotation_center, flip, color, opacity)
+        )
+
+    @classmethod
+    def flush(cls) -> None:
+        """ Submit all sprites in the batch. """
+        entries = cls._entries
+        if not entries:
+            return
+        cls._entries = []
+
+        if cls._sort_mode == SORT_MODE_TEXTURE:
+            entries.sort(key=lambda e: (e[0].blend_mode.value, id(e[0])))
+
+        run_texture = None
+        run_rgb = None
+        run_opacity = 255
+        modded_textures = set()
+
+        for texture, source_rect, x, y, width, height, rotation_angle, rotation_center, flip, color, opacity in entries:
+            rgb = (color.r, color.g, color.b) if color else None
+
+            # Start a new run; the renderer skips mods that are already set on the texture
+            if texture is not run_texture or rgb != run_rgb or opacity != run_opacity:
+                if rgb:
+                    Renderer.set_texture_color_mod(texture, color)
+                else:
+                    Renderer.clear_texture_color_mod(texture)
+                Renderer.set_texture_alpha_mod(texture, opacity)
+
+                if rgb or opacity != 255:
+                    modded_textures.add(texture)
+
+                run_texture = texture
+                run_rgb = rgb
+                run_opacity = opacity
+
+            if rotation_angle or flip:
+                Renderer.copy_raw(texture, source_rect, x, y, width, height, rotation_angle, rotation_center, flip)
+            else:
+                Renderer.copy_plain(texture, source_rect, x, y, width, height)
+
+        # Leave the textures without mods for anything else that draws them
+        for texture in modded_textures:
+            Renderer.clear_texture_color_mod(texture)
+            Renderer.clear_texture_alpha_mod(texture)
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 import math
-from typing import TYPE_CHECKING
+from array import array
+from bisect import bisect_right
+from itertools import chain
+from operator import add
+from typing import Type, TYPE_CHECKING
+from weakref import finalize, WeakSet
 
 from potion.bitmap_font import BitmapFont
 from potion.content import Content
@@ -11,12 +16,14 @@ from potion.data_types.color import Color
 from potion.data_types.point import Point
 from potion.data_types.rect import Rect
 from potion.glyph import Glyph
-from potion.log import Log
 from potion.renderer import Renderer
+from potion.text_atlas import TextAtlas
 from potion.text_effect import TextEffect
 from potion.utilities import pmath
 
 if TYPE_CHECKING:
+    import sdl2
+
     from potion.camera import Camera
 
 
@@ -26,9 +33,28 @@ ALIGN_RIGHT = 2
 ALIGN_TOP = 3
 ALIGN_BOTTOM = 4
 
+# The offset of each line from its left-aligned position, by horizontal alignment
+_LINE_OFFSETS = {
+    ALIGN_LEFT: lambda max_line_width, line_width: 0,
+    ALIGN_CENTER: lambda max_line_width, line_width: (max_line_width - line_width) // 2,
+    ALIGN_RIGHT: lambda max_line_width, line_width: math.ceil(max_line_width - line_width),
+}
+
+# The offset of the text from its draw position, by alignment, given the text's width or height
+_ALIGNMENT_OFFSETS = {
+    ALIGN_LEFT: lambda size: 0,
+    ALIGN_TOP: lambda size: 0,
+    ALIGN_CENTER: lambda size: -1 * size // 2,
+    ALIGN_RIGHT: lambda size: -1 * size + 1,
+    ALIGN_BOTTOM: lambda size: -1 * size + 1,
+}
+
 
 class Text:
     """ Displays a string of text using a bitmap font. """
+    # Every live text object; their cache textures are all reset by one renderer reset callback
+    _instances: WeakSet[Text] = WeakSet()
+
     def __init__(self, content_path: str) -> None:
         """ `content_path` is the path to the bitmap font texture file. """
         self._font_texture = Content.load_texture(content_path)
@@ -46,24 +72,64 @@ class Text:
         self._color = Color.white()
         self._opacity = 255
 
-        # This texture is used as a cache so that each character doesn't have to be calculated/drawn each frame
+        # This texture is used as a cache so that each character doesn't have to be calculated/drawn each frame.
+        # The cache is a rect in the shared text atlas if there's room, otherwise it's a texture of its own.
         self._cache_texture = Texture.create_target(2, 2)
+        self._cache_rect: Rect | None = None
+        self._cache_width = 2
+        self._cache_height = 2
         self._cache_dirty = False
-        self._cache_disabled = False
-        Renderer.add_reset_callback(self._reset_cache_texture)
+
+        # Releases the cache's atlas rect; this is called when the cache is recreated or the text is destroyed
+        self._release_atlas_rect: finalize | None = None
+
+        # In typewriter mode, revealing more characters only draws the new glyphs on top of the cache.
+        # `_drawn_up_to` is the number of glyphs in the cache.
+        self._append_only = False
+        self._drawn_up_to = 0
+
+        # Text effects can change every frame, so text with tags checks whether the glyphs it would draw have changed.
+        # The cache is only redrawn when this key changes.
+        self._has_tags = False
+        self._cache_key: tuple | None = None
+        Text._instances.add(self)
+
+        # Character widths, so that each character's source rect only has to be looked up once
+        self._width_cache: dict[str, int] = {}
+
+        # The text effect for each tag that has been read, so that the registry is only checked once per tag
+        self._tag_effects: dict[str, Type[TextEffect] | None] = {}
+
+        # For word wrap: the width of the word that starts at each index of the source text
+        self._word_widths: list[int] = []
 
         # List of characters to be rendered in the text string
         self._glyphs: list[Glyph] = []
         self._end_glyph: Glyph | None = None
 
+        # The draw rect, SDL source rect and newline flag of each glyph, in flat arrays for the loops that only need those
+        self._glyph_x = array("i")
+        self._glyph_y = array("i")
+        self._glyph_w = array("i")
+        self._glyph_h = array("i")
+        self._glyph_source_rects: list[sdl2.SDL_Rect] = []
+        self._glyph_newlines = b""
+
+        # The first and last glyph index of each line
+        self._line_starts: list[int] = []
+        self._line_ends: list[int] = []
+        self._line_widths: list[int] = []
+
+        # The glyphs on each line and their X offsets, for looking up glyphs by position
+        # This is None if the glyphs don't all have the font's line height.
+        self._line_glyphs: list[list[Glyph]] | None = None
+        self._line_x_offsets: list[list[int]] = []
+
         # Text alignment
         self._horizontal_alignment = ALIGN_LEFT
         self._vertical_alignment = ALIGN_TOP
         self._alignment_offset = Point.zero()
 
-    def __del__(self) -> None:
-        Renderer.remove_reset_callback(self._reset_cache_texture)
-
     def __str__(self) -> str:
         character_limit = 25
         if len(self.text) > character_limit:
@@ -198,8 +264,14 @@ class Text:
         if value == self._visible_characters:
             return
 
+        # Newly revealed characters can be added to the cache if it was up-to-date (apart from other reveals)
+        append_only = (
+            self._typewriter_mode and value > self._visible_characters and (self._append_only or not self._cache_dirty)
+        )
+
         self._visible_characters = value
         self._set_cache_dirty()
+        self._append_only = append_only
 
     @property
     def color(self) -> Color:
@@ -294,7 +366,7 @@ class Text:
 
         # Add text effect offset
         if glyph.tag and self.effects_enabled:
-            if text_effect := TextEffect.get(glyph.tag):
+            if text_effect := glyph.effect:
                 glyph_offset = text_effect.glyph_offset(glyph)
                 glyph_x += glyph_offset.x
                 glypy_y += glyph_offset.y
@@ -309,7 +381,7 @@ class Text:
     def glyph_color(self, glyph: Glyph) -> Color:
         """ Get the color that the glyph should be drawn as. """
         if glyph.tag and self.effects_enabled:
-            if text_effect := TextEffect.get(glyph.tag):
+            if text_effect := glyph.effect:
                 return text_effect.glyph_color(glyph)
         else:
             return self.color
@@ -317,37 +389,51 @@ class Text:
     def glyph_opacity(self, glyph: Glyph) -> int:
         """ Get the opacity that the glyph should be drawn at. """
         if glyph.tag and self.effects_enabled:
-            if text_effect := TextEffect.get(glyph.tag):
+            if text_effect := glyph.effect:
                 return text_effect.glyph_opacity(glyph)
         else:
             return self.opacity
 
     def glyph_at(self, position: Point) -> Glyph | None:
         """ Get the glyph at a given position. """
+        # Without text effects, glyphs stay on their line and in order, so the glyph can be looked up directly
+        if self._line_glyphs is not None and not (self._has_tags and self.effects_enabled):
+            line = position.y // self._font.line_height
+            if not 0 <= line < len(self._line_glyphs):
+                return None
+
+            i = bisect_right(self._line_x_offsets[line], position.x) - 1
+            if i < 0:
+                return None
+
+            glyph = self._line_glyphs[line][i]
+            if self.glyph_rect(glyph).contains_point(position):
+                return glyph
+
+            return None
+
         for i, glyph in enumerate(self._glyphs):
             if self.glyph_rect(glyph).contains_point(position):
                 return glyph
 
     def line_start(self, line: int) -> int:
         """ Get the glyph index at the start of a line. """
-        for glyph in self._glyphs + [self._end_glyph]:
-            if glyph.line == line:
-                return glyph.index
+        if 0 <= line < len(self._line_starts):
+            return self._line_starts[line]
 
         return 0
 
     def line_end(self, line: int) -> int:
         """ Get the glyph index at the end of a line. """
-        for glyph in reversed(self._glyphs + [self._end_glyph]):
-            if glyph.line == line:
-                return glyph.index
+        if 0 <= line < len(self._line_ends):
+            return self._line_ends[line]
 
         return 0
 
     def draw(self, camera: Camera, position: Point) -> None:
         """ Draw the text at a given position. """
         # Update the cache
-        if self._cache_dirty or self._cache_disabled:
+        if self._cache_dirty or (self._has_tags and self._effects_enabled):
             self._draw_to_cache()
 
         # Convert world position to render position
@@ -357,13 +443,20 @@ class Text:
         # Render texture
         Renderer.copy(
             texture=self._cache_texture,
-            source_rect=None,
+            source_rect=self._cache_rect,
             destination_rect=destination,
             rotation_angle=0,
             rotation_center=None,
             flip=0
         )
 
+    @classmethod
+    def _reset_all(cls) -> None:
+        """ Reset the cache textures of every text object. """
+        TextAtlas.reset()
+        for text in list(cls._instances):
+            text._reset_cache_texture()
+
     def _reset_cache_texture(self) -> None:
         """ Reset the cache texture. """
         self._create_cache_texture()
@@ -371,73 +464,138 @@ class Text:
 
     def _create_cache_texture(self) -> None:
         """ Create the cache texture. """
-        self._cache_texture = Texture.create_target(self.width, self.height)
-        self._cache_texture.set_blend_mode(BlendMode.BLEND)
+        if self._release_atlas_rect:
+            self._release_atlas_rect()
+            self._release_atlas_rect = None
+
+        if atlas_rect := TextAtlas.reserve(self.width, self.height):
+            self._cache_texture = TextAtlas.texture()
+            self._cache_rect = Rect(atlas_rect.x, atlas_rect.y, self.width, self.height)
+            self._release_atlas_rect = finalize(self, TextAtlas.release, atlas_rect)
+        else:
+            self._cache_texture = Texture.create_target(self.width, self.height)
+            self._cache_texture.set_blend_mode(BlendMode.BLEND)
+            self._cache_rect = None
+
+        self._cache_width = self.width
+        self._cache_height = self.height
 
     def _set_cache_dirty(self) -> None:
         """ Set the cache as 'dirty' so that it's redrawn. """
         self._cache_dirty = True
+        self._append_only = False
 
     def _draw_to_cache(self) -> None:
         """ Draw the text to the render texture cache. """
+        glyphs = self._glyphs
+        if self.typewriter_mode:
+            glyphs = glyphs[:self.visible_characters]
+
+        # Only the newly revealed glyphs need to be drawn if the rest of the cache is still valid.
+        # Text effects can move any glyph, so text with effects is always redrawn in full.
+        append_only = (
+            self._append_only
+            and not (self._has_tags and self.effects_enabled)
+            and self._drawn_up_to <= len(glyphs)
+            and self._cache_width == self.width
+            and self._cache_height == self.height
+        )
+
+        # Get the source rect, position, color, and opacity of each glyph
+        draw_list = []
+        source_rects = self._glyph_source_rects
+        if self._has_tags and self.effects_enabled:
+            for glyph in glyphs:
+                if glyph.character == '\n':
+                    continue
+                position = self.glyph_position(glyph)
+                draw_list.append(
+                    (source_rects[glyph.index], position.x, position.y, self.glyph_color(glyph), self.glyph_opacity(glyph))
+                )
+
+            # Skip drawing if nothing changed since the last time the cache was drawn
+            cache_key = tuple(
+                (source_rect.x, source_rect.y, x, y, color.r, color.g, color.b, opacity)
+                for source_rect, x, y, color, opacity in draw_list
+            )
+            if not self._cache_dirty and cache_key == self._cache_key:
+                return
+            self._cache_key = cache_key
+        else:
+            color = self.color
+            opacity = self.opacity
+            glyph_x = self._glyph_x
+            glyph_y = self._glyph_y
+            newlines = self._glyph_newlines
+            first = self._drawn_up_to if append_only else 0
+            for i in range(first, len(glyphs)):
+                if newlines[i]:
+                    continue
+                draw_list.append((source_rects[i], glyph_x[i], glyph_y[i], color, opacity))
+
         # Clear the dirty flag
         self._cache_dirty = False
+        self._append_only = False
+        self._drawn_up_to = len(glyphs)
 
         # Recreate the texture if the size changed
-        if self._cache_texture.width != self.width or self._cache_texture.height != self.height:
+        if self._cache_width != self.width or self._cache_height != self.height:
             self._create_cache_texture()
 
-        with Renderer.render_target(self._cache_texture):
-            Renderer.clear()
-
-            for i, glyph in enumerate(self._glyphs):
-                if self.typewriter_mode and i >= self.visible_characters:
-                    break
-
-                self._draw_glyph(glyph)
-
-    def _draw_glyph(self, glyph: Glyph) -> None:
-        """ Draw a glyph. """
-        # Set destination
-        destination = self.glyph_rect(glyph)
-
-        # Don't draw newlines
-        if glyph.character == '\n':
-            return
-
-        # Set color
-        glyph_color = self.glyph_color(glyph)
-        Renderer.set_texture_color_mod(self._font_texture, glyph_color)
+        font_texture = self._font_texture
 
-        # Set opacity
-        glyph_opacity = self.glyph_opacity(glyph)
-        Renderer.set_texture_alpha_mod(self._font_texture, glyph_opacity)
+        # Glyphs are drawn relative to the top-left corner of the cache
+        cache_rect = self._cache_rect
+        origin_x = cache_rect.x if cache_rect else 0
+        origin_y = cache_rect.y if cache_rect else 0
 
-        # Render texture
-        Renderer.copy(
-            texture=self._font_texture,
-            source_rect=glyph.source_rect,
-            destination_rect=destination,
-            rotation_angle=0,
-            rotation_center=None,
-            flip=0
-        )
+        with Renderer.render_target(self._cache_texture):
+            # Keep the glyphs inside this text's rect in the atlas
+            if cache_rect:
+                Renderer.set_clip_rect(cache_rect)
 
-        # Clear color and opacity
-        Renderer.clear_texture_color_mod(self._font_texture)
-        Renderer.clear_texture_alpha_mod(self._font_texture)
+            if not append_only:
+                if cache_rect:
+                    Renderer.clear_rect(cache_rect)
+                else:
+                    Renderer.clear()
+
+            # Only set the mods when they change between glyphs
+            last_color = None
+            last_opacity = None
+            for source_rect, x, y, color, opacity in draw_list:
+                if color is not last_color:
+                    Renderer.set_texture_color_mod(font_texture, color)
+                    last_color = color
+                if opacity != last_opacity:
+                    Renderer.set_texture_alpha_mod(font_texture, opacity)
+                    last_opacity = opacity
+                self._draw_glyph(source_rect, origin_x + x, origin_y + y)
+
+            # Clear color and opacity
+            Renderer.clear_texture_color_mod(font_texture)
+            Renderer.clear_texture_alpha_mod(font_texture)
+
+    def _draw_glyph(self, source_rect: sdl2.SDL_Rect, x: int, y: int) -> None:
+        """ Draw a glyph, with the font texture's color and opacity mods already set. """
+        Renderer.copy_plain(self._font_texture, source_rect, x, y, source_rect.w, source_rect.h)
 
     def _update_characters(self) -> None:
         """ Update the character source positions and destination offsets when the text changes """
         # Dirty the cache
         self._set_cache_dirty()
-        self._cache_disabled = False
+        self._has_tags = False
 
         # Reset text data
         self._width = 0
         self._height = 0
         self._lines = 0
         self._glyphs.clear()
+        self._update_glyph_arrays()
+
+        # Measure the words in the source text
+        if self.word_wrap:
+            self._update_word_widths()
 
         # The current index of the source text that the cursor is at
         cursor = 0
@@ -452,41 +610,61 @@ class Text:
         x = 0
         y = 0
 
-        # The current tag that we're in
-        tag = None
+        # The width of each line; this is the furthest right edge of any glyph on the line
+        line_widths = [0]
 
-        while cursor < len(self.text):
+        # The current tag that we're in, and its text effect
+        tag = None
+        effect = None
+
+        # Local references for the loop, which runs once per character
+        text = self.text
+        text_length = len(text)
+        append_glyph = self._glyphs.append
+        next_index = 0
+        get_source_rect = self._font.get_source_rect
+        line_height = self._font.line_height
+        tags_enabled = self._tags_enabled
+        word_wrap = self._word_wrap
+        max_line_width = self._max_line_width
+
+        while cursor < text_length:
             # Get the current character
-            char = self.text[cursor]
+            char = text[cursor]
 
             # Handle newline characters
             if char == '\n':
                 # Use space as the visible glyph (although it won't be drawn)
-                source_rect = self._font.get_source_rect(' ')
+                source_rect = get_source_rect(' ')
                 glyph = Glyph(
                     character=char,
                     source_rect=source_rect,
                     destination_offset_x=x,
                     destination_offset_y=y,
                     source_index=cursor,
-                    index=len(self._glyphs),
+                    index=next_index,
                     line=line,
                     column=column,
                     tag=tag,
+                    effect=effect,
                 )
-                self._glyphs.append(glyph)
+                append_glyph(glyph)
+                next_index += 1
+                if x + source_rect.width > line_widths[line]:
+                    line_widths[line] = x + source_rect.width
 
                 x = 0
-                y += self._font.line_height
+                y += line_height
                 line += 1
+                line_widths.append(0)
                 column = 0
                 cursor += 1
                 continue
 
             # Handle tags
-            if self._is_cursor_at_start_of_tag(cursor):
-                # Disable the cache
-                self._cache_disabled = True
+            if tags_enabled and char == '<':
+                # Check the cache every frame, since text effects may change it
+                self._has_tags = True
 
                 # Read current tag
                 tag_str = self._read_tag(cursor)
@@ -494,51 +672,68 @@ class Text:
                 # Set (or clear) the current tag
                 if len(tag_str) and tag_str[0] == '/':
                     tag = None
+                    effect = None
                 else:
                     tag = tag_str
+                    if tag_str not in self._tag_effects:
+                        self._tag_effects[tag_str] = TextEffect.get(tag_str)
+                    effect = self._tag_effects[tag_str]
 
                 # Advance cursor to end of tag
                 cursor_advance = len(tag_str) + 2
                 cursor += cursor_advance
                 continue
 
-            # Handle word wrap
-            if x > 0:
-                if self.word_wrap and self._is_cursor_at_start_of_new_word(cursor):
-                    # Get the next word.
-                    # Spaces are treated as a complete word, otherwise they would never wrap
-                    if char.isspace():
-                        next_word = char
-                    else:
-                        next_word = self._get_next_word(cursor)
-
+            if word_wrap:
+                # Handle word wrap
+                # A new word starts after whitespace; the first character never starts one, since x is still 0
+                if x > 0 and text[cursor - 1].isspace():
                     # Do a carriage return if the next word would exceed the max line width
-                    next_word_width = self._get_word_width(next_word)
-                    if x + next_word_width > self.max_line_width:
+                    next_word_width = self._get_word_width(cursor)
+                    if x + next_word_width > max_line_width:
                         x = 0
-                        y += self._font.line_height
+                        y += line_height
                         line += 1
+                        line_widths.append(0)
                         column = 0
 
-            # Create glyph for character
-            source_rect = self._font.get_source_rect(char)
-            glyph = Glyph(
-                character=char,
-                source_rect=source_rect,
-                destination_offset_x=x,
-                destination_offset_y=y,
-                source_index=cursor,
-                index=len(self._glyphs),
-                line=line,
-                column=column,
-                tag=tag,
-            )
-            self._glyphs.append(glyph)
+                # A line can break before any word, so characters are laid out one at a time
+                run_end = cursor + 1
+            else:
+                # Lay out the run of characters up to the next newline or tag in one go
+                run_end = text.find('\n', cursor)
+                if run_end == -1:
+                    run_end = text_length
+                if tags_enabled:
+                    tag_start = text.find('<', cursor, run_end)
+                    if tag_start != -1:
+                        run_end = tag_start
+
+            # Create glyphs for characters
+            for char in text[cursor:run_end]:
+                source_rect = get_source_rect(char)
+                glyph = Glyph(
+                    character=char,
+                    source_rect=source_rect,
+                    destination_offset_x=x,
+                    destination_offset_y=y,
+                    source_index=cursor,
+                    index=next_index,
+                    line=line,
+                    column=column,
+                    tag=tag,
+                    effect=effect,
+                )
+                append_glyph(glyph)
+                next_index += 1
+
+                # Advance the cursor
+                x += source_rect.width
+                column += 1
+                cursor += 1
 
-            # Advance the cursor
-            x += source_rect.width
-            column += 1
-            cursor += 1
+            if x > line_widths[line]:
+                line_widths[line] = x
 
         # Create the end glyph
         source_rect = self._font.get_source_rect(' ')
@@ -548,156 +743,139 @@ class Text:
             destination_offset_x=x,
             destination_offset_y=y,
             source_index=cursor,
-            index=len(self._glyphs),
+            index=next_index,
             line=line,
             column=column,
             tag=tag,
+            effect=effect,
         )
 
         # Now that all glyphs have been generated, alignment and text size can be calculated
         self._lines = line + 1
+        self._line_widths = line_widths
+        self._update_line_indices()
         self._height = self._lines * self._font.line_height
         if len(self._glyphs):
             self._apply_horizontal_alignment()
-            self._update_width()
+            self._update_glyph_arrays()
             self._update_alignment_offset()
+        self._update_line_glyphs()
+
+    def _update_glyph_arrays(self) -> None:
+        """ Copy the glyph rects into flat arrays. """
+        glyphs = self._glyphs
+        self._glyph_x = array("i", [glyph.destination_offset_x for glyph in glyphs])
+        self._glyph_y = array("i", [glyph.destination_offset_y for glyph in glyphs])
+        self._glyph_w = array("i", [glyph.source_rect.width for glyph in glyphs])
+        self._glyph_h = array("i", [glyph.source_rect.height for glyph in glyphs])
+        self._glyph_newlines = bytes(glyph.character == '\n' for glyph in glyphs)
+
+        # Glyphs for the same character share a source rect, so each one is only converted once
+        sdl_rects = {}
+        self._glyph_source_rects = []
+        for glyph in glyphs:
+            sdl_rect = sdl_rects.get(id(glyph.source_rect))
+            if sdl_rect is None:
+                sdl_rect = glyph.source_rect.to_sdl_rect()
+                sdl_rects[id(glyph.source_rect)] = sdl_rect
+            self._glyph_source_rects.append(sdl_rect)
+
+    def _update_line_indices(self) -> None:
+        """ Find the first and last glyph index of each line, including the end glyph. """
+        self._line_starts = [0] * self._lines
+        self._line_ends = [0] * self._lines
+
+        previous_line = None
+        for glyph in chain(self._glyphs, (self._end_glyph,)):
+            if glyph.line != previous_line:
+                self._line_starts[glyph.line] = glyph.index
+                previous_line = glyph.line
+            self._line_ends[glyph.line] = glyph.index
+
+    def _update_line_glyphs(self) -> None:
+        """ Group the glyphs by line, with their X offsets in order. """
+        line_height = self._font.line_height
+        self._line_glyphs = [[] for _ in range(self._lines)]
+        self._line_x_offsets = [[] for _ in range(self._lines)]
+
+        if any(height != line_height for height in self._glyph_h):
+            self._line_glyphs = None
+            self._line_x_offsets = []
+            return
 
-    def _is_cursor_at_start_of_new_word(self, cursor: int) -> bool:
-        """ Check if the cursor is at the start of a new word. """
-        # If this is the very first character, we never want this to be true, otherwise it would always start by
-        #   inserting a newline.
-        if cursor == 0:
-            return False
-
-        previous_char = self.text[cursor-1]
-
-        if previous_char.isspace():
-            return True
-        else:
-            return False
+        for glyph, x in zip(self._glyphs, self._glyph_x):
+            self._line_glyphs[glyph.line].append(glyph)
+            self._line_x_offsets[glyph.line].append(x)
 
-    def _get_next_word(self, cursor: int) -> str:
-        """ Find the next word in the text.
-        This assumes the cursor position is on the first character of the next word.
-        """
-        text_remainder = self.text[cursor:]
-        next_word = text_remainder.split(maxsplit=1)[0]
-        return next_word
+    def _update_word_widths(self) -> None:
+        """ Measure the source text in one pass, so that the width of any word can be looked up. """
+        text = self.text
+        word_widths = [0] * len(text)
 
-    def _get_word_width(self, word: str) -> int:
-        """ Calculate the width in pixels of a word. """
+        # Walk backwards, so that each word's width is known by the time its first character is reached
         word_width = 0
-        for char in word:
-            word_width += self._font.get_source_rect(char).width
+        for i in range(len(text) - 1, -1, -1):
+            char = text[i]
+            if char == '\n':
+                # Newlines are never part of a word, and aren't in the font
+                word_width = 0
+            elif char.isspace():
+                # Spaces are treated as a complete word, otherwise they would never wrap
+                word_widths[i] = self._char_width(char)
+                word_width = 0
+            else:
+                word_width += self._char_width(char)
+                word_widths[i] = word_width
 
-        return word_width
+        self._word_widths = word_widths
 
-    def _is_cursor_at_start_of_tag(self, cursor: int) -> bool:
-        """ Check if the cursor is at the start of a tag. """
-        if not self._tags_enabled:
-            return False
+    def _get_word_width(self, cursor: int) -> int:
+        """ Get the width in pixels of the word that starts at the cursor. """
+        return self._word_widths[cursor]
 
-        current_char = self.text[cursor]
-        if cursor > 0:
-            previous_char = self.text[cursor - 1]
-        else:
-            previous_char = ''
+    def _char_width(self, char: str) -> int:
+        """ Get the width in pixels of a character. """
+        width = self._width_cache.get(char)
+        if width is None:
+            width = self._font.get_source_rect(char).width
+            self._width_cache[char] = width
 
-        if current_char == '<':
-            return True
-        else:
-            return False
+        return width
 
     def _read_tag(self, cursor: int) -> str:
         """ Read a tag and return its value.
         This assumes the cursor position is on the left angle bracket of the tag.
         """
-        i = cursor + 1
-        tag = ""
-        while (char := self.text[i]) != '>':
-            tag += char
-            i += 1
-        return tag
+        end = self.text.index('>', cursor + 1)
+        return self.text[cursor + 1:end]
 
     def _apply_horizontal_alignment(self) -> None:
-        """ Adjust the horizontal position of each character to align each line. """
-        # Get the number of lines
-        num_lines = self._glyphs[-1].line + 1
-
-        # Initialize line widths
-        line_widths = []
-        for _ in range(num_lines):
-            line_widths.append(0)
-
-        # Find the width of each line
-        for char in self._glyphs:
-            x = char.destination_offset_x + char.source_rect.width
-            if x > line_widths[char.line]:
-                line_widths[char.line] = x
-
-        # Get the max line width
+        """ Adjust the horizontal position of each character to align each line, and update the width of the text.
+        This uses the line widths that were measured while the glyphs were generated, so it only needs one pass over
+        the glyphs.
+        """
+        # Calculate each line offset based on alignment
+        line_widths = self._line_widths
         max_line_width = max(line_widths)
+        line_offset = _LINE_OFFSETS[self._horizontal_alignment]
+        line_offsets = [line_offset(max_line_width, line_width) for line_width in line_widths]
 
-        # Calculate each line offset based on alignment
-        line_offsets = []
-        for line_width in line_widths:
-            if self._horizontal_alignment == ALIGN_LEFT:
-                offset_x = 0
-            elif self._horizontal_alignment == ALIGN_CENTER:
-                offset_x = (max_line_width - line_width) // 2
-            elif self._horizontal_alignment == ALIGN_RIGHT:
-                offset_x = math.ceil(max_line_width - line_width)
-            else:
-                offset_x = 0
-                Log.error(f"Invalid horizontal alignment: {self._horizontal_alignment}")
+        # Each line starts at its offset, and ends at its offset plus its width
+        self._width = max(map(add, line_offsets, line_widths)) - min(line_offsets)
 
-            line_offsets.append(offset_x)
+        # Left-aligned lines are already in place
+        if self._horizontal_alignment == ALIGN_LEFT:
+            return
 
         # Apply alignment offset to characters
         for char in self._glyphs:
-            line_offset = line_offsets[char.line]
-            char.destination_offset_x += line_offset
-
-    def _update_width(self) -> None:
-        """ Update the width of the text by finding the min and max X positions of all characters. """
-        x_min = None
-        x_max = None
-
-        for char in self._glyphs:
-            # Skip newlines
-            if char == '\n':
-                continue
-
-            left = char.destination_offset_x
-            right = char.destination_offset_x + char.source_rect.width
-            if x_min is None or left < x_min:
-                x_min = left
-            if x_max is None or right > x_max:
-                x_max = right
-
-        self._width = x_max - x_min
+            char.destination_offset_x += line_offsets[char.line]
 
-    # noinspection DuplicatedCode
     def _update_alignment_offset(self) -> None:
         """ Update the offsets based on the alignment. """
-        if self._horizontal_alignment == ALIGN_LEFT:
-            x = 0
-        elif self._horizontal_alignment == ALIGN_CENTER:
-            x = -1 * self._width // 2
-        elif self._horizontal_alignment == ALIGN_RIGHT:
-            x = -1 * self.width + 1
-        else:
-            x = 0
-            Log.error(f"Invalid horizontal alignment: {self._horizontal_alignment}")
-
-        if self._vertical_alignment == ALIGN_TOP:
-            y = 0
-        elif self._vertical_alignment == ALIGN_CENTER:
-            y = -1 * self._height // 2
-        elif self._vertical_alignment == ALIGN_BOTTOM:
-            y = -1 * self.height + 1
-        else:
-            y = 0
-            Log.error(f"Invalid vertical alignment: {self._vertical_alignment}")
-
+        x = _ALIGNMENT_OFFSETS[self._horizontal_alignment](self._width)
+        y = _ALIGNMENT_OFFSETS[self._vertical_alignment](self._height)
         self._alignment_offset = Point(x, y)
+
+
+Renderer.add_reset_callback(Text._reset_all)
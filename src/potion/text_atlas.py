@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from potion.content_types.texture import Texture
+from potion.data_types.blend_mode import BlendMode
+from potion.data_types.rect import Rect
+
+
+# The width and height of the shared atlas texture
+ATLAS_SIZE = 1024
+
+
+@dataclass
+class _Shelf:
+    """ A row of rects in the atlas. """
+    # The top edge of the shelf
+    y: int
+
+    # The height of the tallest rect that fits on the shelf
+    height: int
+
+    # The left edge of the free space at the end of the shelf
+    x: int = 0
+
+
+class TextAtlas:
+    """ A shared render target that text caches are packed into.
+
+    Each text reserves a rect in the atlas instead of creating its own render target. Rects are packed into shelves:
+    rows that are filled left to right, with a new shelf started below the last one when no shelf has room.
+    Released rects are reused for later reservations that fit in them.
+    """
+    _texture: Texture | None = None
+    _shelves: list[_Shelf] = []
+    _free_rects: list[Rect] = []
+
+    # The ids of the rects that are currently reserved
+    _reserved: set[int] = set()
+
+    @classmethod
+    def texture(cls) -> Texture:
+        """ Get the atlas texture, creating it if needed. """
+        if cls._texture is None:
+            cls._texture = Texture.create_target(ATLAS_SIZE, ATLAS_SIZE)
+            cls._texture.set_blend_mode(BlendMode.BLEND)
+
+        return cls._texture
+
+    @classmethod
+    def reserve(cls, width: int, height: int) -> Rect | None:
+        """ Reserve a rect in the atlas that is at least `width` x `height`.
+        Returns None if the size is empty, or there is no room left in the atlas.
+        """
+        if width <= 0 or height <= 0 or width > ATLAS_SIZE or height > ATLAS_SIZE:
+            return None
+
+        rect = cls._reserve_free_rect(width, height) or cls._reserve_shelf_rect(width, height)
+        if rect:
+            cls._reserved.add(id(rect))
+
+        return rect
+
+    @classmethod
+    def release(cls, rect: Rect) -> None:
+        """ Release a reserved rect, so that it can be reused. """
+        if id(rect) not in cls._reserved:
+            return
+
+        cls._reserved.remove(id(rect))
+
+        # Start packing from scratch once nothing is using the atlas
+        if not cls._reserved:
+            cls._shelves.clear()
+            cls._free_rects.clear()
+        else:
+            cls._free_rects.append(rect)
+
+    @classmethod
+    def reset(cls) -> None:
+        """ Release every rect and the texture; the texture is recreated the next time it's needed. """
+        cls._texture = None
+        cls._shelves.clear()
+        cls._free_rects.clear()
+        cls._reserved.clear()
+
+    @classmethod
+    def _reserve_free_rect(cls, width: int, height: int) -> Rect | None:
+        """ Reuse the smallest released rect that fits. """
+        best = None
+        for rect in cls._free_rects:
+            if rect.width >= width and rect.height >= height:
+                if best is None or rect.width * rect.height < best.width * best.height:
+                    best = rect
+
+        if best:
+            cls._free_rects.remove(best)
+
+        return best
+
+    @classmethod
+    def _reserve_shelf_rect(cls, width: int, height: int) -> Rect | None:
+        """ Place a new rect on the shortest shelf that fits it, or on a new shelf. """
+        best = None
+        for shelf in cls._shelves:
+            if shelf.height >= height and shelf.x + width <= ATLAS_SIZE:
+                if best is None or shelf.height < best.height:
+                    best = shelf
+
+        if best is None:
+            shelf_y = cls._shelves[-1].y + cls._shelves[-1].height if cls._shelves else 0
+            if shelf_y + height > ATLAS_SIZE:
+                return None
+
+            best = _Shelf(shelf_y, height)
+            cls._shelves.append(best)
+
+        rect = Rect(best.x, best.y, width, best.height)
+        best.x += width
+        return rect
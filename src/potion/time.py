@@ -10,8 +10,9 @@ class Time:
     __ticks = 0
     __previous_ticks = 0
 
-    # Engine fixed framerate
+    # Engine fixed framerate, and the duration of one frame in seconds
     __engine_framerate = 0
+    _frame_delta_s = 0.0
 
     # Time elapsed since the last frame
     delta_time_ms = 0
@@ -21,6 +22,7 @@ class Time:
     def set_engine_framerate(cls, framerate: int) -> None:
         """ Set the framerate that the engine is running at. """
         cls.__engine_framerate = framerate
+        cls._frame_delta_s = 1 / framerate if framerate else 0.0
 
     @classmethod
     def update(cls) -> None:
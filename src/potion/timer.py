@@ -14,7 +14,7 @@ class Timer:
         self._running = False
         self._finished = False
         self._loop = True
-        self._delta = Time.frames_to_s(1)
+        self._delta = Time._frame_delta_s
 
         self.set_duration(duration)
 
@@ -1,17 +1,33 @@
+import atexit
+import contextlib
 import datetime
 import inspect
+import io
 import os
 import platform
 import shutil
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import field, dataclass
 from pathlib import Path
-from zipfile import ZipFile
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
 
 from PIL import Image
 
 
+# The write buffer size used when zipping content
+ZIP_BUFFER_SIZE = 4 * 1024 * 1024
+
+# The number of threads that read content files while they're being zipped
+ZIP_READ_THREADS = 4
+
+# Folders that are being deleted in the background
+_purge_threads: list[threading.Thread] = []
+
+
 @dataclass
 class AppInfo:
     name: str
@@ -32,15 +48,21 @@ class BuildSettings:
     debug: bool
     output_folder: Path
 
+    # Run PyInstaller in this process, instead of starting a new interpreter for it.
+    # Builds that need to be isolated from the calling process can turn this off.
+    in_process: bool = True
+
 
 def build(app_info: AppInfo, build_settings: BuildSettings) -> int:
     """ Build the application. """
     # Paths
     # The build_path is the folder where the build is run. It gets cleaned up before and after every build.
     build_path = build_settings.output_folder / "build"
-    pyinstaller_work_path = build_path / "work"
     pyinstaller_spec_path = build_path / "spec"
 
+    # The work path is kept between builds, so that PyInstaller can reuse its analysis from the previous build
+    pyinstaller_work_path = build_settings.output_folder / "work"
+
     # The dist_path is where the application is built to
     if build_settings.debug:
         dist_path = build_settings.output_folder / "debug"
@@ -53,8 +75,8 @@ def build(app_info: AppInfo, build_settings: BuildSettings) -> int:
     _validate_content(app_info.content_root)
 
     # Clean paths
-    shutil.rmtree(build_path, ignore_errors=True)
-    shutil.rmtree(dist_path, ignore_errors=True)
+    _async_purge(build_path)
+    _async_purge(dist_path)
 
     # Create paths
     build_settings.output_folder.mkdir(parents=True, exist_ok=True)
@@ -103,7 +125,77 @@ def build(app_info: AppInfo, build_settings: BuildSettings) -> int:
     cmd += [app_info.script_path.as_posix()]
 
     # Build
-    if build_settings.quiet:
+    # PyInstaller 6.5 compiles bytecode at the optimization level of the interpreter that runs it, so the build
+    # only runs in-process when this interpreter already has the level that the build needs.
+    optimize = 0 if build_settings.debug else 2
+    if build_settings.in_process and sys.flags.optimize == optimize:
+        returncode = _run_pyinstaller_in_process(cmd[1:], build_settings.quiet)
+    else:
+        returncode = _run_pyinstaller_subprocess(cmd, build_settings.quiet, optimize)
+
+    # Clean paths
+    _async_purge(build_path)
+
+    return returncode
+
+
+def _async_purge(path: Path) -> None:
+    """ Delete a folder in the background.
+    The folder is renamed first, so that a new folder can be created at the same path right away.
+    """
+    if not path.exists():
+        return
+
+    stale_path = path.with_name(f"{path.name}.stale.{os.getpid()}.{time.time_ns()}")
+    try:
+        os.replace(path, stale_path)
+    except OSError:
+        # The folder can't be moved (e.g. a file in it is open), so delete it in place
+        shutil.rmtree(path, ignore_errors=True)
+        return
+
+    thread = threading.Thread(target=shutil.rmtree, args=(stale_path,), kwargs={"ignore_errors": True}, daemon=True)
+    thread.start()
+    _purge_threads.append(thread)
+
+
+def _wait_for_purges() -> None:
+    """ Wait for the background deletes to finish. """
+    for thread in _purge_threads:
+        thread.join()
+    _purge_threads.clear()
+
+
+atexit.register(_wait_for_purges)
+
+
+def _run_pyinstaller_in_process(args: list[str], quiet: bool) -> int:
+    """ Run PyInstaller in this process, and return its exit code. """
+    if quiet:
+        output = contextlib.ExitStack()
+        output.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        output.enter_context(contextlib.redirect_stderr(io.StringIO()))
+    else:
+        output = contextlib.nullcontext()
+
+    with output:
+        from PyInstaller.__main__ import run as pyinstaller_run
+
+        try:
+            pyinstaller_run(args)
+        except SystemExit as e:
+            if e.code is None:
+                return 0
+            if isinstance(e.code, int):
+                return e.code
+            return 1
+
+    return 0
+
+
+def _run_pyinstaller_subprocess(cmd: list[str], quiet: bool, optimize: int) -> int:
+    """ Run PyInstaller in a new process, and return its exit code. """
+    if quiet:
         stdout = subprocess.PIPE
         stderr = subprocess.PIPE
     else:
@@ -111,17 +203,10 @@ def build(app_info: AppInfo, build_settings: BuildSettings) -> int:
         stderr = sys.stderr
 
     env = os.environ.copy()
-    if build_settings.debug:
-        env['PYTHONOPTIMIZE'] = "0"
-    else:
-        env['PYTHONOPTIMIZE'] = "2"
+    env['PYTHONOPTIMIZE'] = str(optimize)
 
     proc = subprocess.Popen(cmd, env=env, stdout=stdout, stderr=stderr)
     proc.communicate()
-
-    # Clean paths
-    shutil.rmtree(build_path, ignore_errors=True)
-
     return proc.returncode
 
 
@@ -151,24 +236,17 @@ def _validate_content(content_path: Path) -> None:
 
 def _write_icon_file(src: Path, dst: Path) -> None:
     """ Write the icon file to the build folder. """
-    image = Image.open(src)
+    # Convert to RGBA once, rather than for each size that is written
+    with Image.open(src) as im:
+        image = im.convert("RGBA")
+
+    # The icon is validated to be 256x256, but don't ask for sizes larger than the source
     sizes = [
-        (256, 256),
-        (96, 96),
-        (80, 80),
-        (72, 72),
-        (64, 64),
-        (60, 60),
-        (48, 48),
-        (40, 40),
-        (36, 36),
-        (32, 32),
-        (30, 30),
-        (24, 24),
-        (20, 20),
-        (16, 16),
+        (size, size)
+        for size in (256, 96, 80, 72, 64, 60, 48, 40, 36, 32, 30, 24, 20, 16)
+        if size <= min(image.size)
     ]
-    image.save(dst, sizes=sizes)
+    image.save(dst, format="ICO", sizes=sizes)
 
 
 def _write_version_file(file_path: Path, app_info: AppInfo) -> None:
@@ -216,10 +294,44 @@ def _write_version_file(file_path: Path, app_info: AppInfo) -> None:
 def _zip_content(src: Path, dst: Path) -> None:
     """ Zip the content root to a file. """
     files_to_zip = []
-    for root, dirs, files in src.walk():
-        for f in files:
-            files_to_zip.append(root / f)
-
-    with ZipFile(dst, 'w') as zf:
-        for file in files_to_zip:
-            zf.write(file, arcname=file.relative_to(src))
+    _collect_files(src, "", files_to_zip)
+
+    # Content files (PNG, OGG, etc.) are already compressed, so they're stored as-is.
+    # The file is written through a large buffer, since zipfile makes many small writes per file.
+    # Files are read on a thread pool, and written from this thread in their original order.
+    with (
+        open(dst, 'wb', buffering=ZIP_BUFFER_SIZE) as fp,
+        ZipFile(fp, 'w', compression=ZIP_STORED, allowZip64=True) as zf,
+        ThreadPoolExecutor(max_workers=ZIP_READ_THREADS) as executor,
+    ):
+        paths = [path for path, _, _ in files_to_zip]
+        for (_, arcname, st), data in zip(files_to_zip, executor.map(_read_file, paths)):
+            zf.writestr(_zip_info(arcname, st), data)
+
+
+def _read_file(path: str) -> bytes:
+    """ Read the contents of a file. """
+    with open(path, 'rb') as fp:
+        return fp.read()
+
+
+def _zip_info(arcname: str, st: os.stat_result) -> ZipInfo:
+    """ Get the zip info for a file, with the same metadata that `ZipFile.write` would store. """
+    zip_info = ZipInfo(arcname, time.localtime(st.st_mtime)[0:6])
+    zip_info.external_attr = (st.st_mode & 0xFFFF) << 16
+    zip_info.file_size = st.st_size
+    zip_info.compress_type = ZIP_STORED
+    return zip_info
+
+
+def _collect_files(directory: Path | str, arcname_prefix: str, files: list[tuple[str, str, os.stat_result]]) -> None:
+    """ Recursively collect the paths of the files in a directory, along with their names in the zip file and their
+    stats. The paths are kept as strings, and the stats come from the directory listing where the OS provides them.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            arcname = arcname_prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                _collect_files(entry.path, arcname + "/", files)
+            else:
+                files.append((entry.path, arcname, entry.stat()))
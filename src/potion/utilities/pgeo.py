@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import Sequence, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from potion.data_types.circle import Circle
@@ -13,29 +13,69 @@ def rect_intersects_rect(a: Rect, b: Rect) -> bool:
 
 
 def circle_intersects_circle(a: Circle, b: Circle) -> bool:
-    """ Check if two circles intersect. """
-    return a.center().distance_to_f(b.center()) <= a.radius + b.radius
+    """ Check if two circles intersect.
+    The squared distance between the centers is compared, so no points are created and no square root is needed.
+    """
+    dx = a.x - b.x
+    dy = a.y - b.y
+    radii = a.radius + b.radius
+    return dx * dx + dy * dy <= radii * radii
 
 
 def rect_intersects_circle(r: Rect, c: Circle) -> bool:
     """ Check if a rectangle intersects a circle.
-    Logic and diagram: https://stackoverflow.com/a/43546279
+    The point in the rectangle closest to the circle's center is found by clamping the center to the rectangle's edges;
+    they intersect if that point is inside the circle.
+    """
+    left = r.x
+    top = r.y
+    right = left + r.width - 1
+    bottom = top + r.height - 1
+    cx = c.x
+    cy = c.y
+
+    # Find the closest point in the rectangle to the center of the circle
+    closest_x = left if cx < left else right if cx > right else cx
+    closest_y = top if cy < top else bottom if cy > bottom else cy
+
+    dx = cx - closest_x
+    dy = cy - closest_y
+    radius = c.radius
+    return dx * dx + dy * dy <= radius * radius
+
+
+def rects_intersect_rects(ax: Sequence[int],
+                          ay: Sequence[int],
+                          aw: Sequence[int],
+                          ah: Sequence[int],
+                          bx: Sequence[int],
+                          by: Sequence[int],
+                          bw: Sequence[int],
+                          bh: Sequence[int],
+                          ) -> list[bool]:
+    """ Check if many pairs of rectangles intersect.
+    The rectangles are given as parallel sequences (e.g. `array.array`) of x, y, width and height values; pair `i` is
+    rectangle `i` from the A sequences and rectangle `i` from the B sequences.
+    This gives the same results as `rect_intersects_rect`, without creating a Rect for each one.
+    """
+    return [
+        x2 <= x1 + w1 - 1 and x1 <= x2 + w2 - 1 and y2 <= y1 + h1 - 1 and y1 <= y2 + h2 - 1
+        for x1, y1, w1, h1, x2, y2, w2, h2 in zip(ax, ay, aw, ah, bx, by, bw, bh)
+    ]
+
+
+def circles_intersect_circles(ax: Sequence[float],
+                              ay: Sequence[float],
+                              ar: Sequence[float],
+                              bx: Sequence[float],
+                              by: Sequence[float],
+                              br: Sequence[float],
+                              ) -> list[bool]:
+    """ Check if many pairs of circles intersect.
+    The circles are given as parallel sequences of x, y and radius values (see `rects_intersect_rects`).
+    The squared distances are compared, so no square roots are needed.
     """
-    # Check if the center point of the circle is inside the rectangle
-    if r.contains_point(c.center()):
-        return True
-
-    # Check if any of the rectangle corners are inside the circle
-    if c.contains(r.top_left()) or c.contains(r.top_right()) or c.contains(r.bottom_left()) or c.contains(r.bottom_right()):
-        return True
-
-    # Check if any of the rectangle edges intersect the circle
-    distance_x = abs(c.x - r.center().x)
-    distance_y = abs(c.y - r.center().y)
-    if distance_x <= r.width / 2 and distance_y < r.height / 2 + c.radius:
-        return True
-    if distance_y <= r.height / 2 and distance_x < r.width / 2 + c.radius:
-        return True
-
-    # If none of the above conditions are met, there is no intersection
-    return False
+    return [
+        (x1 - x2) * (x1 - x2) + (y1 - y2) * (y1 - y2) <= (r1 + r2) * (r1 + r2)
+        for x1, y1, r1, x2, y2, r2 in zip(ax, ay, ar, bx, by, br)
+    ]
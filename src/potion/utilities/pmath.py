@@ -11,7 +11,9 @@ def sign(n: int | float) -> int:
 
 def clamp(value: float, min_value: float, max_value: float) -> int | float:
     """ Returns the value clamped to the inclusive range of min and max. """
-    return max(min_value, min(value, max_value))
+    # Equivalent to max(min_value, min(value, max_value)), without the builtin calls
+    value = max_value if value > max_value else value
+    return value if value > min_value else min_value
 
 
 def remap(value: float, old_min: float, old_max: float, new_min: float, new_max: float) -> float:
@@ -29,7 +31,11 @@ def lerp(a: float, b: float, t: float) -> float:
     When t = 0.5, returns the midpoint of and b.
     """
     value = a * (1 - t) + b * t
-    return clamp(value, min(a, b), max(a, b))
+
+    # Clamp the value between a and b
+    low, high = (b, a) if b < a else (a, b)
+    value = high if value > high else value
+    return value if value > low else low
 
 
 def snap_to_interval(value: float, interval: int) -> int:
@@ -44,6 +50,7 @@ def random_bool() -> bool:
 
 def smooth_step(a: float, b: float, t: float) -> float:
     """ Interpolate between two values with smoothing at the limits. """
-    t = clamp(t, 0, 1)
+    t = 1 if t > 1 else t
+    t = t if t > 0 else 0
     t = -2 * t * t * t + 3 * t * t
     return b * t + a * (1 - t)
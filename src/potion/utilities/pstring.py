@@ -1,6 +1,10 @@
 import re
 
 
+# Matches any character that isn't an ASCII letter or digit
+SPECIAL_CHARACTERS_PATTERN = re.compile('[^a-zA-Z0-9]')
+
+
 def remove_special_characters(s: str) -> str:
     """ Remove all non-alphanumeric characters from a string. """
-    return re.sub('[^a-zA-Z0-9]', '', s)
+    return SPECIAL_CHARACTERS_PATTERN.sub('', s)
@@ -1,6 +1,6 @@
+from collections import OrderedDict
 from ctypes import byref, c_int, POINTER
 from enum import Enum
-from math import floor
 from typing import Callable
 
 import sdl2
@@ -11,6 +11,16 @@ from potion.data_types.rect import Rect
 from potion.log import Log
 
 
+# The number of recently used viewport textures to keep, so that resizing back and forth doesn't recreate them
+VIEWPORT_TEXTURE_CACHE_SIZE = 3
+
+# Scratch ints that SDL writes the window position and size into, so that they aren't allocated for every query
+_scratch_a = c_int()
+_scratch_b = c_int()
+_scratch_ref_a = byref(_scratch_a)
+_scratch_ref_b = byref(_scratch_b)
+
+
 class WindowMode(Enum):
     NONE = 0
     WINDOWED = 1
@@ -25,13 +35,24 @@ class ViewportMode(Enum):
 
 
 class Window:
-    """ The main window for the application. """
+    """ The main window for the application.
+    The getters that are called every frame are static methods, which are cheaper to call than class methods.
+    """
     _initialized = False
 
     _title = ""
 
     _sdl_window = None
 
+    # The last known position and size of the window, so that SDL doesn't have to be queried every time.
+    # These are cleared whenever the window may have moved or changed size.
+    _position: tuple[int, int] | None = None
+    _size: tuple[int, int] | None = None
+
+    # The desktop display mode of the display that the window is on, used when switching to fullscreen.
+    # This is cleared when the window moves to another display.
+    _display_mode: sdl2.SDL_DisplayMode | None = None
+
     _window_mode_change_queued = False
     _next_window_mode = WindowMode.NONE
 
@@ -45,6 +66,11 @@ class Window:
     _viewport_mode: ViewportMode = ViewportMode.FIT_RENDERER
     _viewport_scale: int = 1
     _viewport_texture: Texture | None = None
+    _viewport_textures: OrderedDict[tuple[int, int], Texture] = OrderedDict()
+
+    # The methods that apply each window mode and update each viewport mode; these are filled in below the class
+    _window_mode_setters: dict[WindowMode, Callable[[], None]] = {}
+    _viewport_updaters: dict[ViewportMode, Callable[[], None]] = {}
 
     # Callbacks
     _resize_callbacks = CallbackList("WindowResize")
@@ -72,9 +98,13 @@ class Window:
         from potion.mouse import Mouse
         Mouse.init_cursors()
 
+        # Query the display mode up front, so that switching to fullscreen doesn't have to
+        cls._get_display_mode()
+
         # Install callbacks
         cls.add_resize_callback(cls.update_viewport)
         Renderer.add_resolution_change_callback(cls.update_viewport)
+        Renderer.add_reset_callback(cls._reset_viewport_textures)
 
         cls._initialized = True
 
@@ -108,24 +138,27 @@ class Window:
     @classmethod
     def position(cls) -> tuple[int, int]:
         """ The position of the window. """
-        x = c_int()
-        y = c_int()
-        sdl2.SDL_GetWindowPosition(cls._sdl_window, byref(x), byref(y))
-        return int(x.value), int(y.value)
+        if cls._position is None:
+            sdl2.SDL_GetWindowPosition(cls._sdl_window, _scratch_ref_a, _scratch_ref_b)
+            cls._position = _scratch_a.value, _scratch_b.value
+
+        return cls._position
 
     @classmethod
     def set_position(cls, position: tuple[int, int]) -> None:
         x = int(position[0])
         y = int(position[1])
         sdl2.SDL_SetWindowPosition(cls._sdl_window, x, y)
+        cls._position = None
 
-    @classmethod
-    def size(cls) -> tuple[int, int]:
+    @staticmethod
+    def size() -> tuple[int, int]:
         """ The window size. """
-        w = c_int()
-        h = c_int()
-        sdl2.SDL_GetWindowSize(cls._sdl_window, byref(w), byref(h))
-        return int(w.value), int(h.value)
+        if Window._size is None:
+            sdl2.SDL_GetWindowSize(Window._sdl_window, _scratch_ref_a, _scratch_ref_b)
+            Window._size = _scratch_a.value, _scratch_b.value
+
+        return Window._size
 
     @classmethod
     def set_size(cls, size: tuple[int, int]) -> None:
@@ -133,16 +166,32 @@ class Window:
         w = int(size[0])
         h = int(size[1])
         sdl2.SDL_SetWindowSize(cls._sdl_window, w, h)
+        cls._size = None
 
     @classmethod
-    def width(cls) -> int:
-        """ The window width. """
-        return cls.size()[0]
+    def invalidate_geometry_cache(cls) -> None:
+        """ Forget the cached window position and size.
+        This is called when SDL reports that the window moved or changed size.
+        """
+        cls._position = None
+        cls._size = None
 
     @classmethod
-    def height(cls) -> int:
+    def invalidate_display_mode(cls) -> None:
+        """ Forget the cached display mode.
+        This is called when SDL reports that the window moved to another display, or that a display changed.
+        """
+        cls._display_mode = None
+
+    @staticmethod
+    def width() -> int:
+        """ The window width. """
+        return Window.size()[0]
+
+    @staticmethod
+    def height() -> int:
         """ The window height. """
-        return cls.size()[1]
+        return Window.size()[1]
 
     @classmethod
     def is_windowed(cls) -> bool:
@@ -167,13 +216,13 @@ class Window:
         """ Pointer to the SDL window object. """
         return cls._sdl_window
 
-    @classmethod
-    def viewport(cls) -> Rect:
+    @staticmethod
+    def viewport() -> Rect:
         """ The region of the window that the game draws to.
         The size of the viewport will always be *at least* the game resolution, but may be scaled higher in fixed
             increments (1x, 2x, 3x, etc.) to best fit inside the window.
         """
-        return cls._viewport
+        return Window._viewport
 
     @classmethod
     def set_viewport(cls, viewport: Rect) -> None:
@@ -215,17 +264,17 @@ class Window:
         cls._viewport_mode = ViewportMode.MATCH_WINDOW
         cls.update_viewport()
 
-    @classmethod
-    def viewport_scale(cls) -> int:
+    @staticmethod
+    def viewport_scale() -> int:
         """ The scale of the viewport, relative to the game resolution.
         This is only calculated / used if the viewport mode is FIT_RENDERER
         """
-        return cls._viewport_scale
+        return Window._viewport_scale
 
-    @classmethod
-    def viewport_texture(cls) -> Texture:
+    @staticmethod
+    def viewport_texture() -> Texture:
         """ The texture that all cameras in the game render to. """
-        return cls._viewport_texture
+        return Window._viewport_texture
 
     @classmethod
     def show(cls) -> None:
@@ -286,15 +335,8 @@ class Window:
         """
         # Window mode change
         if cls._window_mode_change_queued:
-            match cls._next_window_mode:
-                case WindowMode.WINDOWED:
-                    cls._set_windowed()
-                case WindowMode.BORDERLESS_WINDOWED:
-                    cls._set_borderless_windowed()
-                case WindowMode.FULLSCREEN:
-                    cls._set_fullscreen()
-                case _:
-                    pass
+            if set_window_mode := cls._window_mode_setters.get(cls._next_window_mode):
+                set_window_mode()
             cls._window_mode_change_queued = False
             cls._next_window_mode = WindowMode.NONE
 
@@ -306,20 +348,13 @@ class Window:
             - Any time the render targets reset or render device reset event occurs
             - Any time the viewport mode changes
         """
-        match cls._viewport_mode:
-            case ViewportMode.FREE:
-                cls._update_viewport_free()
-            case ViewportMode.FIT_RENDERER:
-                cls._update_viewport_fit_renderer()
-            case ViewportMode.MATCH_WINDOW:
-                cls._update_viewport_match_window()
-
-        cls.on_viewport_changed()
+        cls._viewport_updaters[cls._viewport_mode]()
+        cls._viewport_changed_callbacks.execute_callbacks()
 
     @classmethod
     def _update_viewport_free(cls) -> None:
         cls._viewport_scale = 1
-        cls._viewport_texture = Texture.create_target(cls.viewport().width, cls.viewport().height)
+        cls._viewport_texture = cls._get_viewport_texture(cls.viewport().width, cls.viewport().height)
 
     @classmethod
     def _update_viewport_fit_renderer(cls) -> None:
@@ -328,37 +363,53 @@ class Window:
         window_w = cls.width()
         window_h = cls.height()
 
-        center_x = floor(window_w / 2)
-        center_y = floor(window_h / 2)
-
         resolution_x, resolution_y = Renderer.resolution()
 
         # Calculate scale
-        scale_x = window_w / resolution_x
-        scale_y = window_h / resolution_y
-        scale = min(scale_x, scale_y)
-
-        # Floor the result for pixel-perfect scaling (increments of 1x, 2x, 3x, etc.)
-        scale = floor(scale)
+        # Integer division floors the result for pixel-perfect scaling (increments of 1x, 2x, 3x, etc.)
+        scale = min(window_w // resolution_x, window_h // resolution_y)
         if scale < 1:
             scale = 1
 
-        # Viewport dimensions
+        # Viewport dimensions, centered in the window
         w = resolution_x * scale
         h = resolution_y * scale
-        x = center_x - floor(w / 2)
-        y = center_y - floor(h / 2)
+        x = window_w // 2 - w // 2
+        y = window_h // 2 - h // 2
 
         # Update viewport
         cls._viewport = Rect(x, y, w, h)
         cls._viewport_scale = scale
-        cls._viewport_texture = Texture.create_target(int(w), int(h))
+        cls._viewport_texture = cls._get_viewport_texture(w, h)
 
     @classmethod
     def _update_viewport_match_window(cls) -> None:
         cls._viewport = Rect(0, 0, cls.width(), cls.height())
         cls._viewport_scale = 1
-        cls._viewport_texture = Texture.create_target(cls.width(), cls.height())
+        cls._viewport_texture = cls._get_viewport_texture(cls.width(), cls.height())
+
+    @classmethod
+    def _get_viewport_texture(cls, width: int, height: int) -> Texture:
+        """ Get a viewport texture of the given size, reusing a recently used one if possible.
+        The viewport texture is cleared every frame, so its old contents don't matter.
+        """
+        size = (width, height)
+        if texture := cls._viewport_textures.get(size):
+            cls._viewport_textures.move_to_end(size)
+            return texture
+
+        texture = Texture.create_target(width, height)
+        cls._viewport_textures[size] = texture
+        if len(cls._viewport_textures) > VIEWPORT_TEXTURE_CACHE_SIZE:
+            cls._viewport_textures.popitem(last=False)
+
+        return texture
+
+    @classmethod
+    def _reset_viewport_textures(cls) -> None:
+        """ Recreate the viewport texture after the render targets or render device reset. """
+        cls._viewport_textures.clear()
+        cls.update_viewport()
 
     @classmethod
     def add_resize_callback(cls, callback: Callable) -> None:
@@ -420,6 +471,17 @@ class Window:
         """ Called when the viewport changes. """
         cls._viewport_changed_callbacks.execute_callbacks()
 
+    @classmethod
+    def _get_display_mode(cls) -> sdl2.SDL_DisplayMode:
+        """ Get the desktop display mode of the display that the window is on. """
+        if cls._display_mode is None:
+            display_index = sdl2.SDL_GetWindowDisplayIndex(cls._sdl_window)
+            display_mode = sdl2.SDL_DisplayMode()
+            sdl2.SDL_GetDesktopDisplayMode(display_index, display_mode)
+            cls._display_mode = display_mode
+
+        return cls._display_mode
+
     @classmethod
     def _set_windowed(cls) -> None:
         """ Execute the queued change to windowed mode. """
@@ -431,10 +493,11 @@ class Window:
 
         # Set the window to windowed
         sdl2.SDL_SetWindowFullscreen(cls._sdl_window, 0)
+        cls.invalidate_geometry_cache()
 
         # Invoke callbacks
-        cls.on_window_resized()
-        cls.on_window_windowed()
+        cls._resize_callbacks.execute_callbacks()
+        cls._windowed_callbacks.execute_callbacks()
 
     @classmethod
     def _set_borderless_windowed(cls) -> None:
@@ -446,10 +509,11 @@ class Window:
 
         # Set the window to fullscreen desktop
         sdl2.SDL_SetWindowFullscreen(cls._sdl_window, sdl2.SDL_WINDOW_FULLSCREEN_DESKTOP)
+        cls.invalidate_geometry_cache()
 
         # Invoke callbacks
-        cls.on_window_resized()
-        cls.on_window_fullscreen()
+        cls._resize_callbacks.execute_callbacks()
+        cls._fullscreen_callbacks.execute_callbacks()
 
     @classmethod
     def _set_fullscreen(cls) -> None:
@@ -459,23 +523,27 @@ class Window:
             cls._last_windowed_position = cls.position()
             cls._last_windowed_size = cls.size()
 
-        # Get display mode information from current monitor
-        display_index = sdl2.SDL_GetWindowDisplayIndex(cls._sdl_window)
-        display_bounds = sdl2.SDL_Rect()
-        sdl2.SDL_GetDisplayBounds(display_index, display_bounds)
-
-        # Set window size to match display
-        sdl2.SDL_SetWindowSize(cls._sdl_window, display_bounds.w, display_bounds.h)
-        sdl2.SDL_SetWindowPosition(cls._sdl_window, display_bounds.x, display_bounds.y)
-
-        # Set fullscreen display mode
-        display_mode = sdl2.SDL_DisplayMode()
-        sdl2.SDL_GetDesktopDisplayMode(display_index, display_mode)
-        sdl2.SDL_SetWindowDisplayMode(cls._sdl_window, display_mode)
+        # Use the desktop display mode of the current monitor.
+        # SDL moves and sizes the window to cover the display when it goes fullscreen.
+        sdl2.SDL_SetWindowDisplayMode(cls._sdl_window, cls._get_display_mode())
 
         # Set window to fullscreen
         sdl2.SDL_SetWindowFullscreen(cls._sdl_window, sdl2.SDL_WINDOW_FULLSCREEN)
+        cls.invalidate_geometry_cache()
 
         # Invoke callbacks
-        cls.on_window_resized()
-        cls.on_window_fullscreen()
+        cls._resize_callbacks.execute_callbacks()
+        cls._fullscreen_callbacks.execute_callbacks()
+
+
+Window._window_mode_setters = {
+    WindowMode.WINDOWED: Window._set_windowed,
+    WindowMode.BORDERLESS_WINDOWED: Window._set_borderless_windowed,
+    WindowMode.FULLSCREEN: Window._set_fullscreen,
+}
+
+Window._viewport_updaters = {
+    ViewportMode.FREE: Window._update_viewport_free,
+    ViewportMode.FIT_RENDERER: Window._update_viewport_fit_renderer,
+    ViewportMode.MATCH_WINDOW: Window._update_viewport_match_window,
+}
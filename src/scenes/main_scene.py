@@ -1,56 +1,178 @@
+from __future__ import annotations
+
+from typing import Callable, TYPE_CHECKING
+
 from potion import *
 
 import game_globals
+from entities.entity_pool import EntityPool
 from entities.game_manager import GameManager
 from entities.screen_wipe import ScreenWipe
 from entities.camera_controller import CameraController
-from entities.mario_brick import MarioBrick
-from entities.mario_question import MarioQuestion
-from entities.moving_platform import MovingPlatform
-from entities.invisible_platform import InvisiblePlatform
-from entities.goomba import Goomba
 from entities.player import Player
-from entities.mario_coin import MarioCoin
-from entities.grass import Grass
-from entities.cracked_block import CrackedBlock
-from entities.bomb_shop import BombShop
-from entities.shop_fire import ShopFire
-from entities.coin_ui import CoinUi
-from entities.rupee_ui import RupeeUi
-from entities.hearts_ui import HeartsUi
-from entities.keys_ui import KeysUi
-from entities.bombs_ui import BombsUi
-from entities.chest import Chest
-from entities.oktorok import Oktorok
-from entities.door import Door
-from entities.bonfire import Bonfire
-from entities.fog_wall import FogWall
-from entities.boss import Boss
-from entities.dark_souls_ui import DarkSoulsUi
-from entities.bridge import Bridge
-from entities.axe import Axe
-from entities.bone_spawner import BoneSpawner
-from entities.spider_spawner import SpiderSpawner
-from entities.undertale_box import UndertaleBox
-from entities.undertale_manager import UndertaleManager
-from entities.undertale_bg import UndertaleBg
-from entities.undertale_ui import UndertaleUi
+
+if TYPE_CHECKING:
+    from entities.bone_spawner import BoneSpawner
+    from entities.fog_wall import FogWall
+    from entities.mario_question import MarioQuestion
+    from entities.moving_platform import MovingPlatform
+    from entities.oktorok import Oktorok
+    from entities.spider_spawner import SpiderSpawner
+
+
+# The custom fields that are copied to each configurable entity, as (LDtk field name, attribute name) pairs
+MARIO_QUESTION_FIELDS = (("Invisible", "invisible"),)
+FOG_WALL_FIELDS = (("Flip", "flip_horizontal"),)
+SPAWNER_FIELDS = (("Slot", "slot"),)
+OKTOROK_FIELDS = (("FacingLeft", "facing_left"), ("Range", "range"))
+MOVING_PLATFORM_FIELDS = (("CycleTime", "cycle_time"), ("XDistance", "x_distance"), ("YDistance", "y_distance"))
+
+
+def _copy_fields(target: object, custom_fields: dict, fields: tuple[tuple[str, str], ...]) -> None:
+    """ Copy each custom field that is set to its attribute on the target. """
+    for src, dst in fields:
+        value = custom_fields.get(src)
+        if value is not None:
+            setattr(target, dst, value)
+
+
+def _configure_mario_question(e: MarioQuestion, custom_fields: dict) -> None:
+    _copy_fields(e, custom_fields, MARIO_QUESTION_FIELDS)
+
+
+def _configure_fog_wall(e: FogWall, custom_fields: dict) -> None:
+    _copy_fields(e.sprite, custom_fields, FOG_WALL_FIELDS)
+
+
+def _configure_spawner(e: BoneSpawner | SpiderSpawner, custom_fields: dict) -> None:
+    _copy_fields(e, custom_fields, SPAWNER_FIELDS)
+
+
+def _configure_oktorok(e: Oktorok, custom_fields: dict) -> None:
+    _copy_fields(e, custom_fields, OKTOROK_FIELDS)
+
+
+def _configure_moving_platform(e: MovingPlatform, custom_fields: dict) -> None:
+    _copy_fields(e, custom_fields, MOVING_PLATFORM_FIELDS)
+
+
+# The background color of the main camera
+_BG_CLEAR = Color.from_hex("#1c1734")
+
+# Shared by every LDtk entity that has no custom fields; it's only ever read
+EMPTY_DICT: dict = {}
+
+# The entities that LDtk entities are swapped with, by LDtk entity name.
+# These are filled in by `_load_entity_factories` when the first world is loaded, so that the entity modules aren't
+#   imported while the start screen is up.
+ENTITY_FACTORIES: dict[str, type[Entity]] = {}
+
+# Entities that are configured with the LDtk entity's custom fields after they're created
+CONFIGURABLE_FACTORIES: dict[str, tuple[type[Entity], Callable[[Entity, dict], None]]] = {}
+
+# The UI entities that are added to each world, in the order that they're added
+WORLD_UI: dict[str, tuple[type[Entity], ...]] = {}
+
+# The LDtk entities that are placed in each world
+WORLD_ENTITIES: dict[str, tuple[str, ...]] = {
+    "mario_world": ("Goomba", "MarioBrick", "MarioCoin", "MarioQuestion", "MovingPlatform"),
+    "zelda_world": (
+        "BombShop", "Chest", "CrackedBlock", "Door", "Grass", "InvisiblePlatform", "MovingPlatform", "ShopFire",
+    ),
+    "dark_souls_world": ("Bonfire", "Boss", "CrackedBlock", "FogWall"),
+    "undertale_world": ("BoneSpawner", "SpiderSpawner", "UndertaleBox"),
+    "castle_world": ("Axe", "Boss", "Bridge"),
+}
+
+# The entity factories and configurable factories for the entities in each world, so that each world only looks its
+#   own entities up. Worlds that aren't listed here use the full tables.
+WORLD_FACTORIES: dict[str, tuple[dict[str, type[Entity]], dict[str, tuple[type[Entity], Callable]]]] = {}
+
+
+def _load_entity_factories() -> None:
+    from entities.axe import Axe
+    from entities.bomb_shop import BombShop
+    from entities.bombs_ui import BombsUi
+    from entities.bone_spawner import BoneSpawner
+    from entities.bonfire import Bonfire
+    from entities.boss import Boss
+    from entities.bridge import Bridge
+    from entities.chest import Chest
+    from entities.coin_ui import CoinUi
+    from entities.cracked_block import CrackedBlock
+    from entities.dark_souls_ui import DarkSoulsUi
+    from entities.door import Door
+    from entities.fog_wall import FogWall
+    from entities.goomba import Goomba
+    from entities.grass import Grass
+    from entities.hearts_ui import HeartsUi
+    from entities.invisible_platform import InvisiblePlatform
+    from entities.keys_ui import KeysUi
+    from entities.mario_brick import MarioBrick
+    from entities.mario_coin import MarioCoin
+    from entities.mario_question import MarioQuestion
+    from entities.moving_platform import MovingPlatform
+    from entities.oktorok import Oktorok
+    from entities.rupee_ui import RupeeUi
+    from entities.shop_fire import ShopFire
+    from entities.spider_spawner import SpiderSpawner
+    from entities.undertale_bg import UndertaleBg
+    from entities.undertale_box import UndertaleBox
+    from entities.undertale_manager import UndertaleManager
+    from entities.undertale_ui import UndertaleUi
+
+    ENTITY_FACTORIES.update({
+        "MarioBrick": MarioBrick,
+        "MarioCoin": MarioCoin,
+        "Goomba": Goomba,
+        "Grass": Grass,
+        "BombShop": BombShop,
+        "ShopFire": ShopFire,
+        "CrackedBlock": CrackedBlock,
+        "Chest": Chest,
+        "Door": Door,
+        "Bonfire": Bonfire,
+        "Boss": Boss,
+        "Bridge": Bridge,
+        "Axe": Axe,
+        "UndertaleBox": UndertaleBox,
+        "InvisiblePlatform": InvisiblePlatform,
+    })
+
+    CONFIGURABLE_FACTORIES.update({
+        "MarioQuestion": (MarioQuestion, _configure_mario_question),
+        "FogWall": (FogWall, _configure_fog_wall),
+        "BoneSpawner": (BoneSpawner, _configure_spawner),
+        "SpiderSpawner": (SpiderSpawner, _configure_spawner),
+        "Oktorok": (Oktorok, _configure_oktorok),
+        "MovingPlatform": (MovingPlatform, _configure_moving_platform),
+    })
+
+    for world, names in WORLD_ENTITIES.items():
+        WORLD_FACTORIES[world] = (
+            {name: ENTITY_FACTORIES[name] for name in names if name in ENTITY_FACTORIES},
+            {name: CONFIGURABLE_FACTORIES[name] for name in names if name in CONFIGURABLE_FACTORIES},
+        )
+
+    WORLD_UI.update({
+        "mario_world": (CoinUi,),
+        "zelda_world": (HeartsUi, RupeeUi, KeysUi, BombsUi),
+        "dark_souls_world": (DarkSoulsUi,),
+        "undertale_world": (UndertaleManager, UndertaleBg, UndertaleUi),
+    })
 
 
 class MainScene(Scene):
     def setup_cameras(self) -> None:
-        self.main_camera.get_render_pass("Default").set_clear_color(Color.from_hex("#1c1734"))
+        self.main_camera.get_render_pass("Default").set_clear_color(_BG_CLEAR)
 
     def load_entities(self) -> None:
-        self.entities.add(CameraController())
-        self.entities.add(Player())
-        self.entities.add(GameManager())
-        self.entities.add(ScreenWipe())
+        self.entities.add_many((CameraController(), Player(), GameManager(), ScreenWipe()))
 
-        # Load this stuff last! EntityList.update() is called here.
+        # The LDtk entities are left queued, so that they're swapped and added to the scene in a single update
         if game_globals.GO_TO_NEXT_WORLD:
             try:
-                next_world = game_globals.NEXT_WORLD_QUEUE.pop(0)
+                next_world = game_globals.NEXT_WORLD_QUEUE.popleft()
             except IndexError:
                 Log.warning("game_globals.NEXT_WORLD is empty")
                 next_world = ""
@@ -62,104 +184,46 @@ class MainScene(Scene):
             self.name = next_world
             game_globals.CURRENT_WORLD = self.name
             game_globals.GO_TO_NEXT_WORLD = False
-            LDtk.load_simplified(self, f"ldtk/{next_world}.ldtk")
+            LDtk.load_simplified(self, f"ldtk/{next_world}.ldtk", defer_update=True)
         else:
             return
 
+        if not ENTITY_FACTORIES:
+            _load_entity_factories()
+
         # Load entities that are conditional based on world
-        if self.name == "mario_world":
-            self.entities.add(CoinUi())
-        elif self.name == "zelda_world":
-            self.entities.add(HeartsUi())
-            self.entities.add(RupeeUi())
-            self.entities.add(KeysUi())
-            self.entities.add(BombsUi())
-        elif self.name == "dark_souls_world":
-            self.entities.add(DarkSoulsUi())
-        elif self.name == "undertale_world":
-            self.entities.add(UndertaleManager())
-            self.entities.add(UndertaleBg())
-            self.entities.add(UndertaleUi())
-        elif self.name == "castle_world":
-            pass
+        self.entities.add_many([ui() for ui in WORLD_UI.get(self.name, ())])
 
         # Load LDTK
+        # Look everything up once, outside the loop
+        entity_factories, configurable_factories = WORLD_FACTORIES.get(
+            self.name, (ENTITY_FACTORIES, CONFIGURABLE_FACTORIES)
+        )
+        acquire = EntityPool.acquire_from_ldtk
+        to_swap = []
+        append = to_swap.append
+
         for ldtk_entity in LDtk.ldtk_entities(self):
+            metadata = ldtk_entity.metadata
+            name = metadata["ldtk_entity_name"]
 
-            custom_fields = ldtk_entity.metadata.get("ldtk_custom_fields")
-            if not custom_fields:
-                custom_fields = {}
-
-            match ldtk_entity.metadata["ldtk_entity_name"]:
-                case "MarioBrick":
-                    e = MarioBrick()
-                case "MarioQuestion":
-                    e = MarioQuestion()
-                    if invisible := custom_fields.get("Invisible"):
-                        e.invisible = True
-                case "MarioCoin":
-                    e = MarioCoin()
-                case "Goomba":
-                    e = Goomba()
-                case "Grass":
-                    e = Grass()
-                case "BombShop":
-                    e = BombShop()
-                case "ShopFire":
-                    e = ShopFire()
-                case "CrackedBlock":
-                    e = CrackedBlock()
-                case "Chest":
-                    e = Chest()
-                case "Door":
-                    e = Door()
-                case "Bonfire":
-                    e = Bonfire()
-                case "FogWall":
-                    e = FogWall()
-                    if flip := custom_fields.get("Flip"):
-                        e.sprite.flip_horizontal = True
-                case "Boss":
-                    e = Boss()
-                case "Bridge":
-                    e = Bridge()
-                case "Axe":
-                    e = Axe()
-                case "BoneSpawner":
-                    e = BoneSpawner()
-                    if slot := custom_fields.get("Slot"):
-                        e.slot = slot
-                case "SpiderSpawner":
-                    e = SpiderSpawner()
-                    if slot := custom_fields.get("Slot"):
-                        e.slot = slot
-                case "UndertaleBox":
-                    e = UndertaleBox()
-                case "Oktorok":
-                    e = Oktorok()
-                    if facing_left := custom_fields.get("FacingLeft"):
-                        e.facing_left = True
-                    if range_ := custom_fields.get("Range"):
-                        e.range = range_
-                case "InvisiblePlatform":
-                    e = InvisiblePlatform()
-                case "MovingPlatform":
-                    e = MovingPlatform()
-                    if cycle_time := custom_fields.get("CycleTime"):
-                        e.cycle_time = cycle_time
-                    if x_distance := custom_fields.get("XDistance"):
-                        e.x_distance = x_distance
-                    if y_distance := custom_fields.get("YDistance"):
-                        e.y_distance = y_distance
-                case _:
-                    Log.warning(f"Could not swap '{ldtk_entity.name}'")
-                    e = None
-            if e:
-                LDtk.swap_entity(ldtk_entity, e)
+            if factory := entity_factories.get(name):
+                append((ldtk_entity, acquire(factory, ldtk_entity)))
+            elif configurable := configurable_factories.get(name):
+                factory, configure = configurable
+                e = acquire(factory, ldtk_entity)
+                configure(e, metadata.get("ldtk_custom_fields") or EMPTY_DICT)
+                append((ldtk_entity, e))
+            else:
+                Log.warning("Could not swap '%s' in '%s'", ldtk_entity.name, self.name)
+
+        LDtk.swap_entities(to_swap, copy_data=False)
 
     def start(self) -> None:
-        for i, level in enumerate(self.levels):
-            if i == 0:
-                level.set_entities_active(True)
-            else:
-                level.set_entities_active(False)
+        # Only the first level starts active
+        self.activate_only_level(0)
+
+    def end(self) -> None:
+        # Return the entities that can be reused to the pool, for the next world to use
+        for entity in self.entities:
+            EntityPool.release(entity)
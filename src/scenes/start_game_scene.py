@@ -9,3 +9,6 @@ class StartGameScene(Scene):
         self.entities.add(StartGameScreen())
         self.entities.add(GameManager())
         self.entities.add(ScreenWipe())
+
+        # Parse the worlds while the start screen is up, so that they load faster
+        LDtk.preload_simplified([f"ldtk/{item.name}" for item in Content.iterdir("ldtk") if item.suffix == ".ldtk"])